@@ -1,12 +1,19 @@
 """Patient API routes."""
 
+import asyncio
 import logging
 import json
 from datetime import date, datetime
 from typing import Optional, List
-from fastapi import APIRouter, status, Form, File, UploadFile, HTTPException
-from app.schemas.patients import PatientCreate, PatientResponse
-from app.services.patient_service import create_patient, get_all_patients
+from fastapi import APIRouter, status, Form, File, Query, UploadFile, HTTPException
+from app.schemas.patients import PatientCreate, PatientResponse, PatientSummary
+from app.services.patient_service import (
+    create_patient,
+    create_patients_bulk,
+    get_all_patients,
+    get_patient,
+    get_patients_summary,
+)
 from app.utils.cloudinary_service import upload_pdf_to_cloudinary, upload_multiple_pdfs_to_cloudinary
 from app.utils.pdf_service import process_pdf_discharge_summary, process_pdf_report, process_pdf_bill
 from app.services.discharge_parser_service import parse_discharge_summary_with_vision
@@ -20,25 +27,29 @@ router = APIRouter(tags=["patients"])
 
 
 @router.get("", response_model=List[PatientResponse], status_code=status.HTTP_200_OK)
-async def get_all_patients_endpoint() -> List[PatientResponse]:
+async def get_all_patients_endpoint(
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of patients to return"),
+    offset: int = Query(0, ge=0, description="Number of patients to skip"),
+) -> List[PatientResponse]:
     """
-    Get all patient records with their Cloudinary URLs.
-    
+    Get a page of patient records with their Cloudinary URLs.
+
     Returns all patient data including:
     - bill_details: List of Cloudinary URLs for bill PDFs
     - reports: List of Cloudinary URLs for report PDFs
     - doctor_medical_certificate: Cloudinary URL for medical certificate
     - medication_details: Contains discharge_summary_url if available
-    
+
     All Cloudinary URLs are already stored in the database and are directly accessible.
+    For list views that don't need the heavy JSONB payloads, use GET /summary instead.
     """
     try:
         logger.info("Fetching all patients")
-        patients = await get_all_patients()
+        patients = await get_all_patients(limit=limit, offset=offset)
         logger.info(f"Successfully retrieved {len(patients)} patients")
         logger.debug(f"Patients: {patients}")
         return patients
-        
+
     except HTTPException:
         logger.error("HTTPException raised in get_all_patients_endpoint", exc_info=True)
         raise
@@ -50,6 +61,80 @@ async def get_all_patients_endpoint() -> List[PatientResponse]:
         )
 
 
+@router.get("/summary", response_model=List[PatientSummary], status_code=status.HTTP_200_OK)
+async def get_patients_summary_endpoint(
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of patients to return"),
+    offset: int = Query(0, ge=0, description="Number of patients to skip"),
+) -> List[PatientSummary]:
+    """
+    Get a lightweight, paginated listing of patients.
+
+    Only the summary columns are selected, so the heavy JSONB payloads
+    (bill_details, reports, messages, medication_details) never leave the
+    database. Use GET /{patient_id} to fetch a full record.
+    """
+    try:
+        logger.info(f"Fetching patient summaries (limit={limit}, offset={offset})")
+        summaries = await get_patients_summary(limit=limit, offset=offset)
+        logger.info(f"Successfully retrieved {len(summaries)} patient summaries")
+        return summaries
+
+    except HTTPException:
+        logger.error("HTTPException raised in get_patients_summary_endpoint", exc_info=True)
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in get_patients_summary_endpoint: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+@router.get("/{patient_id}", response_model=PatientResponse, status_code=status.HTTP_200_OK)
+async def get_patient_endpoint(patient_id: str) -> PatientResponse:
+    """Get a single patient record with all columns."""
+    try:
+        logger.info(f"Fetching patient {patient_id}")
+        return await get_patient(patient_id)
+
+    except HTTPException:
+        logger.error("HTTPException raised in get_patient_endpoint", exc_info=True)
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in get_patient_endpoint: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+@router.post("/bulk", response_model=List[PatientResponse], status_code=status.HTTP_201_CREATED)
+async def create_patients_bulk_endpoint(patients: List[PatientCreate]) -> List[PatientResponse]:
+    """
+    Create multiple patient records in a single bulk insert.
+
+    Intended for import/migration flows: the whole batch is written with one
+    database request instead of one round trip per patient. Expects a JSON
+    array of patient objects (no file uploads - use the single-patient
+    endpoint for PDF processing).
+    """
+    try:
+        logger.info(f"Bulk creating {len(patients)} patients")
+        results = await create_patients_bulk(patients)
+        logger.info(f"Successfully bulk created {len(results)} patients")
+        return results
+
+    except HTTPException:
+        logger.error("HTTPException raised in create_patients_bulk_endpoint", exc_info=True)
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in create_patients_bulk_endpoint: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
 @router.post("", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
 async def create_patient_endpoint(
     patient_name: str = Form(..., min_length=1, max_length=200),
@@ -117,19 +202,25 @@ async def create_patient_endpoint(
                     )
                 
                 # Step 1: Process PDF: upload PDF, convert to images (for AI processing)
+                # Read the upload stream once here; services take bytes
                 logger.info("Step 1: Uploading PDF and converting to images...")
-                discharge_summary_url, image_bytes_list = await process_pdf_discharge_summary(
-                    discharge_summary_pdf,
+                discharge_summary_url, image_bytes_list, pdf_text = await process_pdf_discharge_summary(
+                    await discharge_summary_pdf.read(),
+                    discharge_summary_pdf.filename,
                     patient_name
                 )
-                
+
                 logger.info(f"✓ PDF uploaded to: {discharge_summary_url}")
-                logger.info(f"✓ Converted PDF to {len(image_bytes_list)} image(s) for AI processing")
-                
+                if pdf_text is not None:
+                    logger.info("✓ Extracted text layer from born-digital PDF for AI processing")
+                else:
+                    logger.info(f"✓ Converted PDF to {len(image_bytes_list)} image(s) for AI processing")
+
                 # Step 2: Parse discharge summary with AI vision model
                 logger.info("Step 2: Parsing discharge summary with AI vision model...")
                 parsed_data = await parse_discharge_summary_with_vision(
-                    image_bytes_list=image_bytes_list
+                    image_bytes_list=image_bytes_list,
+                    pdf_text=pdf_text
                 )
                 
                 logger.info(f"✓ Parsed {len(parsed_data.medications)} medications from discharge summary")
@@ -221,18 +312,23 @@ async def create_patient_endpoint(
                     
                     # Step 1: Process PDF: upload PDF, convert to images (for AI processing)
                     logger.info(f"Step 1: Uploading bill PDF and converting to images...")
-                    bill_url, image_bytes_list = await process_pdf_bill(
-                        bill_file,
+                    bill_url, image_bytes_list, pdf_text = await process_pdf_bill(
+                        await bill_file.read(),
+                        bill_file.filename,
                         patient_name
                     )
-                    
+
                     logger.info(f"✓ Bill PDF uploaded to: {bill_url}")
-                    logger.info(f"✓ Converted PDF to {len(image_bytes_list)} image(s) for AI processing")
-                    
+                    if pdf_text is not None:
+                        logger.info("✓ Extracted text layer from born-digital PDF for AI processing")
+                    else:
+                        logger.info(f"✓ Converted PDF to {len(image_bytes_list)} image(s) for AI processing")
+
                     # Step 2: Parse bill with AI vision model
                     logger.info(f"Step 2: Parsing bill with AI vision model...")
                     parsed_bill = await parse_bill_with_vision(
-                        image_bytes_list=image_bytes_list
+                        image_bytes_list=image_bytes_list,
+                        pdf_text=pdf_text
                     )
                     
                     logger.info(f"✓ Parsed bill: {parsed_bill.name} with {len(parsed_bill.details)} items, total: {parsed_bill.total}")
@@ -288,20 +384,25 @@ async def create_patient_endpoint(
                     
                     # Step 1: Process PDF: upload PDF, convert to images (for AI processing)
                     logger.info(f"Step 1: Uploading report PDF and converting to images...")
-                    report_url, image_bytes_list = await process_pdf_report(
-                        report_file,
+                    report_url, image_bytes_list, pdf_text = await process_pdf_report(
+                        await report_file.read(),
+                        report_file.filename,
                         patient_name
                     )
-                    
+
                     logger.info(f"✓ Report PDF uploaded to: {report_url}")
-                    logger.info(f"✓ Converted PDF to {len(image_bytes_list)} image(s) for AI processing")
-                    
+                    if pdf_text is not None:
+                        logger.info("✓ Extracted text layer from born-digital PDF for AI processing")
+                    else:
+                        logger.info(f"✓ Converted PDF to {len(image_bytes_list)} image(s) for AI processing")
+
                     # Step 2: Parse report with AI vision model
                     logger.info(f"Step 2: Parsing report with AI vision model...")
                     parsed_report = await parse_report_with_vision(
                         image_bytes_list=image_bytes_list,
                         medications=medications_list,
-                        diagnosis=diagnosis
+                        diagnosis=diagnosis,
+                        pdf_text=pdf_text
                     )
                     
                     logger.info(f"✓ Parsed report: {parsed_report.name} with {len(parsed_report.biomarkers)} biomarkers")
@@ -337,52 +438,63 @@ async def create_patient_endpoint(
             logger.info(f"=== REPORT PROCESSING COMPLETED ===")
             logger.info(f"Successfully processed {len(reports_list)} out of {len(reports)} report(s)")
         
-        # Upload medical certificate PDF if provided
-        medical_certificate_url = ""
-        if doctor_medical_certificate:
-            logger.info(f"Uploading medical certificate PDF: {doctor_medical_certificate.filename}")
-            medical_certificate_url = await upload_pdf_to_cloudinary(
-                doctor_medical_certificate,
-                folder=f"medicare/patients/{patient_name.replace(' ', '_')}/certificates"
-            )
-            logger.info(f"Medical certificate uploaded successfully: {medical_certificate_url}")
-        
         # Extract appointment followups from parsed discharge summary if available
         appointment_followups = []
         if parsed_data:
             appointment_followups = parsed_data.appointment_followup
             logger.info(f"Extracted {len(appointment_followups)} appointment followups from discharge summary")
-        
-        # Generate insurer justification document
-        justification_pdf_url = None
-        try:
-            logger.info("=== GENERATING INSURER JUSTIFICATION DOCUMENT ===")
-            discharge_date_str = discharge_date.strftime("%Y-%m-%d") if discharge_date else None
-            admission_date_str = admission_date.strftime("%Y-%m-%d")
-            
-            justification_pdf_url = await generate_insurer_justification_document(
-                patient_name=patient_name,
-                medical_condition=medical_condition,
-                admission_date=admission_date_str,
-                discharge_date=discharge_date_str,
-                age=age,
-                gender=gender,
-                assigned_doctor=assigned_doctor,
-                medication_details=medication_details_dict,
-                bill_details=bills_list,
-                reports=reports_list,
-                doctor_notes=doctor_notes,
+
+        # Upload the medical certificate and generate the insurer justification
+        # document concurrently - both are independent external-service calls,
+        # so the wall-clock cost is max(t1, t2) instead of t1 + t2
+        logger.info("=== GENERATING INSURER JUSTIFICATION DOCUMENT ===")
+        discharge_date_str = discharge_date.strftime("%Y-%m-%d") if discharge_date else None
+        admission_date_str = admission_date.strftime("%Y-%m-%d")
+
+        justification_coro = generate_insurer_justification_document(
+            patient_name=patient_name,
+            medical_condition=medical_condition,
+            admission_date=admission_date_str,
+            discharge_date=discharge_date_str,
+            age=age,
+            gender=gender,
+            assigned_doctor=assigned_doctor,
+            medication_details=medication_details_dict,
+            bill_details=bills_list,
+            reports=reports_list,
+            doctor_notes=doctor_notes,
+        )
+
+        if doctor_medical_certificate:
+            logger.info(f"Uploading medical certificate PDF: {doctor_medical_certificate.filename}")
+            certificate_result, justification_result = await asyncio.gather(
+                upload_pdf_to_cloudinary(
+                    doctor_medical_certificate,
+                    folder=f"medicare/patients/{patient_name.replace(' ', '_')}/certificates"
+                ),
+                justification_coro,
+                return_exceptions=True,
             )
-            
+            # Certificate upload failures abort the request, as before
+            if isinstance(certificate_result, BaseException):
+                raise certificate_result
+            medical_certificate_url = certificate_result
+            logger.info(f"Medical certificate uploaded successfully: {medical_certificate_url}")
+        else:
+            medical_certificate_url = ""
+            justification_result, = await asyncio.gather(justification_coro, return_exceptions=True)
+
+        # Justification failures never fail patient creation - fall back to None
+        if isinstance(justification_result, BaseException):
+            logger.error(f"Error generating insurer justification document: {str(justification_result)}")
+            logger.warning("⚠ Continuing with patient creation despite justification document generation failure")
+            justification_pdf_url = None
+        else:
+            justification_pdf_url = justification_result
             if justification_pdf_url:
                 logger.info(f"✓ Insurer justification document generated: {justification_pdf_url}")
             else:
                 logger.warning("⚠ Insurer justification document generation returned None (continuing anyway)")
-        except Exception as e:
-            logger.error(f"Error generating insurer justification document: {str(e)}", exc_info=True)
-            logger.warning("⚠ Continuing with patient creation despite justification document generation failure")
-            # Don't fail the whole process if justification generation fails
-            justification_pdf_url = None
         
         # Create patient data
         logger.info("Creating PatientCreate object with medication_details")
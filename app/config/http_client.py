@@ -0,0 +1,31 @@
+"""Shared async HTTP client for outbound API calls."""
+
+import httpx
+
+# Module-level client so successive OpenRouter calls reuse TCP+TLS sessions
+# instead of paying a fresh handshake (~200-400ms) per request. HTTP/2
+# multiplexes concurrent parse requests over a single connection.
+_openrouter_client = None
+
+
+def get_openrouter_client() -> httpx.AsyncClient:
+    """Get the shared httpx.AsyncClient used for OpenRouter requests."""
+    global _openrouter_client
+
+    if _openrouter_client is None:
+        _openrouter_client = httpx.AsyncClient(
+            timeout=120.0,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+
+    return _openrouter_client
+
+
+async def close_openrouter_client() -> None:
+    """Close the shared client. Called from the application shutdown hook."""
+    global _openrouter_client
+
+    if _openrouter_client is not None:
+        await _openrouter_client.aclose()
+        _openrouter_client = None
@@ -2,6 +2,7 @@
 
 import os
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,6 +29,17 @@ def get_supabase_client() -> Client:
         if not supabase_url.startswith(("http://", "https://")):
             supabase_url = f"https://{supabase_url}"
         
-        _supabase_client = create_client(supabase_url, supabase_key)
+        # The singleton keeps one PostgREST session alive for the process,
+        # so requests reuse the warm TLS connection to the Supabase edge
+        # instead of re-handshaking per call. Bounded timeouts keep a stuck
+        # database call from pinning a request indefinitely.
+        _supabase_client = create_client(
+            supabase_url,
+            supabase_key,
+            options=ClientOptions(
+                postgrest_client_timeout=10,
+                storage_client_timeout=10,
+            ),
+        )
     
     return _supabase_client
@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 from typing import (
     Any,
     Dict,
@@ -10,6 +11,7 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import app.config.cloudinary
+from app.config.http_client import close_openrouter_client
 from app.api.v1.patients import router as patients_router
 
 # Load environment variables
@@ -22,8 +24,16 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan - close shared clients on shutdown."""
+    yield
+    await close_openrouter_client()
+
+
 app = FastAPI(
     description="Medicare AI Assistant",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
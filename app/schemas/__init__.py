@@ -1,5 +1,5 @@
 """This file contains the schemas for the application."""
-from app.schemas.patients import PatientCreate, PatientResponse, Followup, FollowupStatus
+from app.schemas.patients import PatientCreate, PatientResponse, PatientSummary, Followup, FollowupStatus
 from app.schemas.medications import (
     MedicationDetail,
     DischargeSummaryParsed,
@@ -15,6 +15,7 @@ from app.schemas.bills import BillDetail, BillParsed
 __all__ = [
     "PatientCreate",
     "PatientResponse",
+    "PatientSummary",
     "MedicationDetail",
     "DischargeSummaryParsed",
     "DischargeSummaryUploadResponse",
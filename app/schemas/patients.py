@@ -94,6 +94,25 @@ class PatientUpdate(BaseModel):
         return v
 
 
+class PatientSummary(BaseModel):
+    """Lightweight patient projection for list views.
+
+    Carries only the columns a listing needs - the heavy JSONB fields
+    (bill_details, reports, messages, medication_details) stay in the
+    database and are served by the full PatientResponse endpoints.
+    """
+
+    id: str = Field(..., description="Supabase UUID")
+    patient_name: str = Field(..., description="Patient's full name")
+    age: int = Field(..., ge=0, le=130, description="Patient age in years")
+    gender: str = Field(..., description="Patient gender")
+    medical_condition: str = Field(..., description="Patient's medical condition summary")
+    assigned_doctor: str = Field(..., description="Doctor assigned to the patient")
+    admission_date: date = Field(..., description="Date of patient admission")
+    discharge_date: Optional[date] = Field(None, description="Date of patient discharge")
+    created_at: Optional[datetime] = Field(None, description="Timestamp when patient was created")
+
+
 class PatientResponse(PatientBase):
     """Schema for patient response."""
 
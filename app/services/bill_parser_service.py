@@ -1,10 +1,11 @@
 """Service for parsing medical bills using AI/LLM."""
 
+import asyncio
 import logging
 import json
 import os
 import base64
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
 import httpx
 from dotenv import load_dotenv
@@ -13,6 +14,10 @@ from app.schemas.bills import BillParsed, BillDetail
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Static data-URL prefix - plain concatenation with the base64 string avoids
+# an extra full-size f-string copy of a potentially multi-MB payload
+_JPEG_DATA_URL_PREFIX = "data:image/jpeg;base64,"
+
 
 def get_bill_parsing_prompt() -> str:
     """Generate the parsing prompt for bill extraction."""
@@ -50,22 +55,38 @@ IMPORTANT: Return ONLY a valid JSON object with this exact structure:
 Do not include any explanations, markdown formatting, or additional text. Return ONLY the JSON object.
 """
 
+
+def _encode_image_part(img_bytes: bytes) -> dict:
+    """Base64-encode one page image into a message content part."""
+    base64_image = base64.b64encode(img_bytes).decode('ascii')
+    return {
+        "type": "image_url",
+        "image_url": {"url": _JPEG_DATA_URL_PREFIX + base64_image}
+    }
+
+
 async def parse_bill_with_vision(
     image_bytes_list: list[bytes],
-    model: str = "google/gemini-2.5-pro"
+    model: str = "google/gemini-2.5-pro",
+    pdf_text: Optional[str] = None
 ) -> BillParsed:
     """
-    Parse medical bill using vision model (image-based parsing only).
-    
+    Parse medical bill using the vision model, from page images or, for
+    born-digital PDFs, directly from the extracted text layer.
+
     Args:
         image_bytes_list: List of image bytes from PDF pages
         model: AI model to use for parsing
-    
+        pdf_text: Extracted text layer; when provided, images are skipped
+
     Returns:
         BillParsed object with extracted bill information
     """
     try:
-        logger.info(f"Initializing vision model for parsing {len(image_bytes_list)} bill images")
+        if pdf_text is not None:
+            logger.info(f"Initializing model for parsing bill text ({len(pdf_text)} chars)")
+        else:
+            logger.info(f"Initializing vision model for parsing {len(image_bytes_list)} bill images")
         
         # Get API key from environment
         api_key = os.getenv("OPEN_ROUTER_API_KEY")
@@ -83,23 +104,30 @@ async def parse_bill_with_vision(
         # Strip whitespace from API key
         api_key = api_key.strip()
         
-        # Prepare message content with images
+        # Prepare message content - text layer for born-digital PDFs, page
+        # images otherwise
         prompt = get_bill_parsing_prompt()
-        content = [
-            {
-                "type": "text",
-                "text": prompt + "\n\nAnalyze the following medical bill images:"
-            }
-        ]
-        
-        # Add all images as base64 encoded data URLs
-        for img_bytes in image_bytes_list:
-            base64_image = base64.b64encode(img_bytes).decode('utf-8')
-            data_url = f"data:image/png;base64,{base64_image}"
-            content.append({
-                "type": "image_url",
-                "image_url": {"url": data_url}
-            })
+        if pdf_text is not None:
+            content = [
+                {
+                    "type": "text",
+                    "text": prompt + "\n\nAnalyze the following medical bill text:\n\n" + pdf_text
+                }
+            ]
+        else:
+            content = [
+                {
+                    "type": "text",
+                    "text": prompt + "\n\nAnalyze the following medical bill images:"
+                }
+            ]
+
+            # Base64-encode all pages in a thread pool - the CPU-bound
+            # encoding runs off the event loop and in parallel across pages
+            image_parts = await asyncio.gather(
+                *(asyncio.to_thread(_encode_image_part, img_bytes) for img_bytes in image_bytes_list)
+            )
+            content.extend(image_parts)
         
         # Prepare request payload
         payload = {
@@ -171,12 +199,12 @@ async def parse_bill_with_vision(
         
         # Parse JSON response
         try:
-            # Remove markdown code blocks if present
+            # Remove markdown code blocks if present (prefix/suffix strip avoids
+            # the list allocation of split("```") on large responses)
             if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
+                response_text = response_text[3:]
+                response_text = response_text.removeprefix("json").removeprefix("JSON")
+                response_text = response_text.removesuffix("```").strip()
             
             parsed_json = json.loads(response_text)
             logger.info("Successfully parsed AI response to JSON")
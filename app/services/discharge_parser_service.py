@@ -1,14 +1,21 @@
 """Service for parsing discharge summaries using AI/LLM."""
 
+import asyncio
+import io
 import logging
 import json
 import os
 import base64
+import hashlib
 import re
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime, date, timedelta
 from fastapi import HTTPException, status
 import httpx
+import orjson
+from cachetools import LRUCache
+from PIL import Image
 from dotenv import load_dotenv
 from app.schemas.medications import (
     DischargeSummaryParsed,
@@ -18,80 +25,162 @@ from app.schemas.medications import (
     MedicationStatus,
     Reminder,
 )
+from app.config.http_client import get_openrouter_client
 from app.schemas.patients import Followup, FollowupStatus
 from app.utils.pdf_service import generate_action_plan_pdf
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Static data-URL prefix - plain concatenation with the base64 string avoids
+# an extra full-size f-string copy of a potentially multi-MB payload
+_WEBP_DATA_URL_PREFIX = "data:image/webp;base64,"
 
-def convert_time_to_iso(time_str: str, date_obj: date) -> str:
+# Precompiled patterns used by robust_json_parse - compiling once at import
+# avoids re-parsing the same literal patterns on every LLM response
+_FENCE_OPEN_RE = re.compile(r'^```(?:json|JSON)?\s*\n?', re.MULTILINE)
+_FENCE_CLOSE_RE = re.compile(r'\n?```\s*$', re.MULTILINE)
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_LINE_COMMENT_RE = re.compile(r'//.*?$', re.MULTILINE)
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_SINGLE_QUOTED_RE = re.compile(r"'([^']*)'")
+
+# Weekday index (0=Monday) -> DayEnum, in datetime.weekday() order
+_DAY_ENUMS = tuple(DayEnum)
+
+# Parsed results keyed by image-payload hash - byte-identical re-uploads
+# (page refresh, UI retry) skip the 5-15s LLM call entirely
+_PARSE_CACHE: LRUCache = LRUCache(maxsize=256)
+
+# Value -> enum lookup tables so malformed LLM values fall back via dict.get()
+# instead of exception-driven control flow in the per-medication loop
+_FREQUENCY_MAP = {f.value: f for f in FrequencyEnum}
+_DAY_MAP = {d.value: d for d in DayEnum}
+_STATUS_MAP = {s.value: s for s in MedicationStatus}
+_FOLLOWUP_STATUS_MAP = {s.value: s for s in FollowupStatus}
+
+
+def compress_image_for_vision(img_bytes: bytes) -> bytes:
     """
-    Convert time string from formats like '10:00AM', '6:00PM' to ISO 8601 format 'YYYY-MM-DDTHH:mm:ssZ'.
-    
+    Downscale and re-encode a page image to WebP before sending it to the vision model.
+
+    PNG pages from scanned documents are typically 500KB-2MB each and base64
+    inflates them by another 33%. Re-encoding to WebP at ~1600px cuts the
+    upload size 4-8x without hurting OCR quality.
+
+    Args:
+        img_bytes: Original page image bytes (PNG)
+
+    Returns:
+        Compressed image bytes in WebP format
+    """
+    image = Image.open(io.BytesIO(img_bytes))
+    image.thumbnail((1600, 1600), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=85, method=4)
+    return buffer.getvalue()
+
+
+def _encode_image_part(img_bytes: bytes) -> dict:
+    """Compress and base64-encode one page image into a message content part."""
+    compressed_bytes = compress_image_for_vision(img_bytes)
+    base64_image = base64.b64encode(compressed_bytes).decode('ascii')
+    return {
+        "type": "image_url",
+        "image_url": {"url": _WEBP_DATA_URL_PREFIX + base64_image}
+    }
+
+
+@lru_cache(maxsize=512)
+def _parse_time_to_hms(time_str: str) -> tuple[int, int, int]:
+    """
+    Parse a time string like '10:00AM', '6:00PM' or '18:30' to (hour, minute, second).
+
+    Cached because the same handful of time strings repeats for every
+    (day x timing) pair in a medication schedule.
+
     Args:
         time_str: Time string in formats like '10:00AM', '6:00PM', '10:00', etc.
-        date_obj: Date object to combine with time
-    
+
     Returns:
-        ISO 8601 format datetime string (YYYY-MM-DDTHH:mm:ssZ) in 24-hour format
+        Tuple of (hour, minute, second) in 24-hour format
+
+    Raises:
+        ValueError: If the time string cannot be parsed
+        AttributeError: If time_str is not a string
     """
-    try:
-        # Remove whitespace and convert to uppercase
-        time_str = time_str.strip().upper()
-        
-        # Check if it's already in 24-hour format (contains no AM/PM)
-        if 'AM' not in time_str and 'PM' not in time_str:
-            # If it's already in HH:MM format, add seconds
-            if ':' in time_str:
-                parts = time_str.split(':')
-                if len(parts) == 2:
-                    hour = int(parts[0])
-                    minute = int(parts[1])
-                    second = 0
-                elif len(parts) == 3:
-                    hour = int(parts[0])
-                    minute = int(parts[1])
-                    second = int(parts[2])
-                else:
-                    hour = int(parts[0])
-                    minute = 0
-                    second = 0
-            else:
-                hour = int(time_str)
-                minute = 0
+    # Remove whitespace and convert to uppercase
+    time_str = time_str.strip().upper()
+
+    # Check if it's already in 24-hour format (contains no AM/PM)
+    if 'AM' not in time_str and 'PM' not in time_str:
+        # If it's already in HH:MM format, add seconds
+        if ':' in time_str:
+            parts = time_str.split(':')
+            if len(parts) == 2:
+                hour = int(parts[0])
+                minute = int(parts[1])
                 second = 0
-        else:
-            # Parse AM/PM format
-            is_pm = 'PM' in time_str
-            time_str = time_str.replace('AM', '').replace('PM', '').strip()
-            
-            # Split hours and minutes
-            if ':' in time_str:
-                parts = time_str.split(':')
+            elif len(parts) == 3:
                 hour = int(parts[0])
-                minute = int(parts[1]) if len(parts) > 1 else 0
-                second = int(parts[2]) if len(parts) > 2 else 0
+                minute = int(parts[1])
+                second = int(parts[2])
             else:
-                # Just hour, no minutes
-                hour = int(time_str)
+                hour = int(parts[0])
                 minute = 0
                 second = 0
-            
-            # Convert to 24-hour format
-            if is_pm and hour != 12:
-                hour += 12
-            elif not is_pm and hour == 12:
-                hour = 0
-        
-        # Combine date and time into ISO 8601 format
-        datetime_obj = datetime.combine(date_obj, datetime.min.time().replace(hour=hour, minute=minute, second=second))
-        return datetime_obj.strftime("%Y-%m-%dT%H:%M:%SZ")
+        else:
+            hour = int(time_str)
+            minute = 0
+            second = 0
+    else:
+        # Parse AM/PM format
+        is_pm = 'PM' in time_str
+        time_str = time_str.replace('AM', '').replace('PM', '').strip()
+
+        # Split hours and minutes
+        if ':' in time_str:
+            parts = time_str.split(':')
+            hour = int(parts[0])
+            minute = int(parts[1]) if len(parts) > 1 else 0
+            second = int(parts[2]) if len(parts) > 2 else 0
+        else:
+            # Just hour, no minutes
+            hour = int(time_str)
+            minute = 0
+            second = 0
+
+        # Convert to 24-hour format
+        if is_pm and hour != 12:
+            hour += 12
+        elif not is_pm and hour == 12:
+            hour = 0
+
+    return hour, minute, second
+
+
+def convert_time_to_iso(time_str: str, date_obj: date) -> str:
+    """
+    Convert time string from formats like '10:00AM', '6:00PM' to ISO 8601 format 'YYYY-MM-DDTHH:mm:ssZ'.
+
+    Args:
+        time_str: Time string in formats like '10:00AM', '6:00PM', '10:00', etc.
+        date_obj: Date object to combine with time
+
+    Returns:
+        ISO 8601 format datetime string (YYYY-MM-DDTHH:mm:ssZ) in 24-hour format
+    """
+    try:
+        hour, minute, second = _parse_time_to_hms(time_str)
+        if not (0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
+            raise ValueError(f"time out of range: {hour:02d}:{minute:02d}:{second:02d}")
+        # Format directly - f-string formatting of the fixed layout avoids the
+        # datetime.combine/strftime machinery in the reminder hot loop
+        return f"{date_obj.isoformat()}T{hour:02d}:{minute:02d}:{second:02d}Z"
     except (ValueError, AttributeError) as e:
         logger.warning(f"Failed to convert time '{time_str}' to ISO format: {str(e)}")
         # Return default time with the provided date
-        default_time = datetime.combine(date_obj, datetime.min.time().replace(hour=10, minute=0, second=0))
-        return default_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return f"{date_obj.isoformat()}T10:00:00Z"
 
 
 def generate_reminders(
@@ -117,9 +206,7 @@ def generate_reminders(
     # Don't create reminders for "as_needed" medications
     if frequency == FrequencyEnum.AS_NEEDED:
         return []
-    
-    reminders = []
-    
+
     # Determine start and end dates
     today = datetime.now().date()
     if start_date is None:
@@ -140,71 +227,83 @@ def generate_reminders(
         days_to_use = days
     elif frequency == FrequencyEnum.DAILY:
         # Daily means all days
-        days_to_use = list(DayEnum)
+        days_to_use = list(_DAY_ENUMS)
     elif frequency == FrequencyEnum.TWICE_A_WEEK:
         # Twice a week - use start_date day and 3 days later
         start_day_index = start_date.weekday()  # 0=Monday, 6=Sunday
         days_to_use = [
-            DayEnum(list(DayEnum)[start_day_index]),
-            DayEnum(list(DayEnum)[(start_day_index + 3) % 7])
+            _DAY_ENUMS[start_day_index],
+            _DAY_ENUMS[(start_day_index + 3) % 7]
         ]
     elif frequency == FrequencyEnum.WEEKLY:
         # Weekly - use start_date day
-        start_day_index = start_date.weekday()
-        days_to_use = [DayEnum(list(DayEnum)[start_day_index])]
+        days_to_use = [_DAY_ENUMS[start_date.weekday()]]
     elif frequency == FrequencyEnum.ALTERNATE_DAYS:
         # Alternate days - use all days but skip one
         days_to_use = [DayEnum.MONDAY, DayEnum.WEDNESDAY, DayEnum.FRIDAY, DayEnum.SUNDAY]
     else:
         # For custom, use all days if no specific days provided
-        days_to_use = list(DayEnum)
-    
-    # Generate reminders for each day and time combination
-    current_date = start_date
-    
-    # Generate reminders for the date range
-    while current_date <= end_date:
-        current_day_index = current_date.weekday()  # 0=Monday, 6=Sunday
-        current_day_enum = DayEnum(list(DayEnum)[current_day_index])
-        
-        # Check if this day is in our days_to_use list
-        if current_day_enum in days_to_use:
-            # Create a reminder for each time on this day
-            for time_str in timing:
-                # Convert time to ISO 8601 format (YYYY-MM-DDTHH:mm:ssZ)
-                time_iso = convert_time_to_iso(time_str, current_date)
-                reminder = Reminder(
-                    day=current_day_enum,
-                    datte=current_date,
-                    time=time_iso,
-                    isreminded=False,
-                    isresponded=False,
-                )
-                reminders.append(reminder)
-        
-        # Move to next day
-        current_date += timedelta(days=1)
+        days_to_use = list(_DAY_ENUMS)
     
-    return reminders
+    # Precompute the (day, date) schedule for the range, then batch-construct
+    # all reminders in one comprehension (avoids per-item append overhead).
+    # Membership is checked against a frozenset of weekday indices instead of
+    # scanning a list of enums for every day in the range.
+    allowed_weekdays = frozenset(_DAY_ENUMS.index(d) for d in days_to_use)
+    total_days = (end_date - start_date).days + 1
+    schedule = [
+        (_DAY_ENUMS[current.weekday()], current)
+        for current in (start_date + timedelta(days=i) for i in range(total_days))
+        if current.weekday() in allowed_weekdays
+    ]
+
+    # One reminder per (day, time) combination, times in ISO 8601 format.
+    # model_construct skips validation - every field here is already typed.
+    return [
+        Reminder.model_construct(
+            day=day_enum,
+            datte=reminder_date,
+            time=convert_time_to_iso(time_str, reminder_date),
+            isreminded=False,
+            isresponded=False,
+        )
+        for day_enum, reminder_date in schedule
+        for time_str in timing
+    ]
+
+
+@lru_cache(maxsize=4)
+def _format_discharge_prompt(today_name: str, tomorrow_name: str, tomorrow_date: str) -> str:
+    """Format the prompt template for one date context (cached per day)."""
+    return _DISCHARGE_PROMPT_TEMPLATE.format(
+        today_name=today_name,
+        tomorrow_name=tomorrow_name,
+        tomorrow_date=tomorrow_date,
+    )
 
 
 def get_discharge_summary_parsing_prompt() -> str:
     """Generate the parsing prompt with current date context."""
     today = datetime.now()
-    today_name = today.strftime("%A").lower()
     tomorrow = today + timedelta(days=1)
-    tomorrow_name = tomorrow.strftime("%A").lower()
-    tomorrow_date = tomorrow.strftime("%Y-%m-%d")
-    
-    return f"""
+    return _format_discharge_prompt(
+        today.strftime("%A"),
+        tomorrow.strftime("%A"),
+        tomorrow.strftime("%Y-%m-%d"),
+    )
+
+
+# The prompt body is immutable apart from the date tokens, so it lives as a
+# module-level template and is formatted at most once per day via the cache
+_DISCHARGE_PROMPT_TEMPLATE = """
 You are a medical document parser specialized in extracting medication information from discharge summaries.
 
 Your task is to parse the provided discharge summary and extract ALL medication information in a structured format.
 
 IMPORTANT CONTEXT:
-- Today is {today_name.capitalize()}
-- Starting from tomorrow ({tomorrow_name.capitalize()}, {tomorrow_date}), the patient's medications should begin
-- When determining start dates or scheduling medications, use {tomorrow_name.capitalize()} ({tomorrow_date}) as the starting point unless the document specifies otherwise
+- Today is {today_name}
+- Starting from tomorrow ({tomorrow_name}, {tomorrow_date}), the patient's medications should begin
+- When determining start dates or scheduling medications, use {tomorrow_name} ({tomorrow_date}) as the starting point unless the document specifies otherwise
 
 Only Focus on discharge medications suggested by the doctor.
 CRITICAL RULES:
@@ -308,6 +407,47 @@ Do not include any explanations, markdown formatting, or additional text. Return
 """
 
 
+def _extract_balanced_json(text: str) -> Optional[str]:
+    """
+    Extract the first balanced {...} object from text in a single linear scan.
+
+    Tracks string/escape state and brace depth so fences, prose, and trailing
+    junk around the JSON object are skipped in one pass instead of multiple
+    regex traversals of the full response.
+
+    Args:
+        text: Raw text that may contain a JSON object
+
+    Returns:
+        The balanced JSON object substring, or None if no balanced object found
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
 def robust_json_parse(text: str) -> dict:
     """
     Robustly parse JSON from LLM response, handling various edge cases.
@@ -322,48 +462,68 @@ def robust_json_parse(text: str) -> dict:
         HTTPException: If JSON cannot be parsed after all attempts
     """
     original_text = text
-    
-    # Strategy 1: Remove markdown code blocks (multiple patterns)
-    # Handle ```json ... ```, ``` ... ```, ```JSON ... ```
-    text = re.sub(r'^```(?:json|JSON)?\s*\n?', '', text, flags=re.MULTILINE)
-    text = re.sub(r'\n?```\s*$', '', text, flags=re.MULTILINE)
+
+    # Fast path: clean JSON is the common case - try a direct orjson parse
+    # before running any regex scrubbing
     text = text.strip()
-    
-    # Strategy 2: Extract JSON object from text (find first { ... })
-    json_match = re.search(r'\{.*\}', text, re.DOTALL)
-    if json_match:
-        text = json_match.group(0)
-    
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+
+    # Strategy 1: Slice out the balanced {...} object in a single pass and try
+    # it directly - this handles fences and surrounding prose without running
+    # the regex pipeline over the full response
+    extracted = _extract_balanced_json(text)
+    if extracted is not None:
+        try:
+            return orjson.loads(extracted)
+        except orjson.JSONDecodeError:
+            # Continue cleanup on the (much shorter) extracted slice
+            text = extracted
+    else:
+        # No balanced object found - strip markdown code blocks and retry
+        # extraction-style cleanup on the full text
+        text = _FENCE_OPEN_RE.sub('', text)
+        text = _FENCE_CLOSE_RE.sub('', text)
+        text = text.strip()
+
     # Strategy 3: Remove common JSON-invalid characters
     # Remove trailing commas before closing braces/brackets
-    text = re.sub(r',(\s*[}\]])', r'\1', text)
-    
+    text = _TRAILING_COMMA_RE.sub(r'\1', text)
+
     # Strategy 4: Remove single-line comments (// ...)
-    text = re.sub(r'//.*?$', '', text, flags=re.MULTILINE)
-    
+    text = _LINE_COMMENT_RE.sub('', text)
+
     # Strategy 5: Remove multi-line comments (/* ... */)
-    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
+    text = _BLOCK_COMMENT_RE.sub('', text)
     
     # Strategy 6: Fix common escape issues
     # Ensure proper escaping of quotes within strings
     # This is tricky, so we'll try parsing first
     
-    # Try parsing with cleaned text
-    attempts = [
-        ("Cleaned text", text),
-        ("Original text", original_text),
-        ("Text with trailing comma fix", re.sub(r',(\s*[}\]])', r'\1', original_text)),
-    ]
-    
-    for attempt_name, attempt_text in attempts:
-        try:
-            # Try direct JSON parsing
-            parsed = json.loads(attempt_text)
-            logger.info(f"Successfully parsed JSON using: {attempt_name}")
-            return parsed
-        except json.JSONDecodeError as e:
-            logger.debug(f"JSON parse attempt '{attempt_name}' failed: {str(e)}")
-            continue
+    # Try each strategy lazily so later (regex-scrubbing) attempts only run
+    # when the earlier ones actually failed
+    try:
+        parsed = orjson.loads(text)
+        logger.info("Successfully parsed JSON using: Cleaned text")
+        return parsed
+    except orjson.JSONDecodeError as e:
+        logger.debug(f"JSON parse attempt 'Cleaned text' failed: {str(e)}")
+
+    try:
+        parsed = orjson.loads(original_text)
+        logger.info("Successfully parsed JSON using: Original text")
+        return parsed
+    except orjson.JSONDecodeError as e:
+        logger.debug(f"JSON parse attempt 'Original text' failed: {str(e)}")
+
+    try:
+        parsed = orjson.loads(_TRAILING_COMMA_RE.sub(r'\1', original_text))
+        logger.info("Successfully parsed JSON using: Text with trailing comma fix")
+        return parsed
+    except orjson.JSONDecodeError as e:
+        logger.debug(f"JSON parse attempt 'Text with trailing comma fix' failed: {str(e)}")
     
     # Strategy 7: Try to fix common issues and parse again
     try:
@@ -381,12 +541,12 @@ def robust_json_parse(text: str) -> dict:
             attempt_text = attempt_text[:last_brace + 1]
         
         # Fix trailing commas
-        attempt_text = re.sub(r',(\s*[}\]])', r'\1', attempt_text)
+        attempt_text = _TRAILING_COMMA_RE.sub(r'\1', attempt_text)
         
-        parsed = json.loads(attempt_text)
+        parsed = orjson.loads(attempt_text)
         logger.info("Successfully parsed JSON after aggressive cleaning")
         return parsed
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass
     
     # Strategy 8: Try using json5-like fixes (if available) or manual fixes
@@ -407,15 +567,15 @@ def robust_json_parse(text: str) -> dict:
         
         # Fix single quotes to double quotes (but preserve escaped quotes)
         # Only replace single quotes that appear to be string delimiters
-        attempt_text = re.sub(r"'([^']*)'", r'"\1"', attempt_text)
+        attempt_text = _SINGLE_QUOTED_RE.sub(r'"\1"', attempt_text)
         
         # Fix trailing commas again
-        attempt_text = re.sub(r',(\s*[}\]])', r'\1', attempt_text)
+        attempt_text = _TRAILING_COMMA_RE.sub(r'\1', attempt_text)
         
-        parsed = json.loads(attempt_text)
+        parsed = orjson.loads(attempt_text)
         logger.info("Successfully parsed JSON after quote fixes")
         return parsed
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass
     
     # If all strategies fail, log the error and raise exception
@@ -447,13 +607,35 @@ def robust_json_parse(text: str) -> dict:
     )
 
 
-async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], model: str = "google/gemini-2.5-pro") -> DischargeSummaryParsed:
+async def parse_discharge_summary_with_vision(
+    image_bytes_list: list[bytes],
+    model: str = "google/gemini-2.5-pro",
+    pdf_text: Optional[str] = None,
+) -> DischargeSummaryParsed:
     """
-    Parse discharge summary using vision model (image-based parsing only).
+    Parse discharge summary using the vision model, from page images or,
+    for born-digital PDFs, directly from the extracted text layer.
     """
     try:
-        logger.info(f"Initializing vision model for parsing {len(image_bytes_list)} images")
-        
+        if pdf_text is not None:
+            logger.info(f"Initializing model for parsing discharge summary text ({len(pdf_text)} chars)")
+        else:
+            logger.info(f"Initializing vision model for parsing {len(image_bytes_list)} images")
+
+        # Return the cached result for byte-identical re-uploads of the same
+        # document (BLAKE2b is a fast non-cryptographic-grade dedup hash
+        # here). The rendered prompt is part of the key because it embeds
+        # today's/tomorrow's dates and the parse anchors medication start
+        # dates and reminders to them - a re-upload on a later day must
+        # re-parse rather than reuse a schedule anchored to the old date.
+        prompt = get_discharge_summary_parsing_prompt()
+        document_bytes = pdf_text.encode() if pdf_text is not None else b''.join(image_bytes_list)
+        cache_key = hashlib.blake2b(document_bytes + prompt.encode() + model.encode(), digest_size=16).digest()
+        cached_result = _PARSE_CACHE.get(cache_key)
+        if cached_result is not None:
+            logger.info("Returning cached parse result for identical discharge summary upload")
+            return DischargeSummaryParsed.model_validate_json(cached_result)
+
         # Get API key from environment
         api_key = os.getenv("OPEN_ROUTER_API_KEY")
         if not api_key:
@@ -470,23 +652,29 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
         
         # Strip whitespace from API key
         api_key = api_key.strip()
-        # Prepare message content with images
-        prompt = get_discharge_summary_parsing_prompt()
-        content = [
-            {
-                "type": "text",
-                "text": prompt + "\n\nAnalyze the following discharge summary images:"
-            }
-        ]
-        
-        # Add all images as base64 encoded data URLs
-        for img_bytes in image_bytes_list:
-            base64_image = base64.b64encode(img_bytes).decode('utf-8')
-            data_url = f"data:image/png;base64,{base64_image}"
-            content.append({
-                "type": "image_url",
-                "image_url": {"url": data_url}
-            })
+        # Prepare message content - text layer for born-digital PDFs, page
+        # images otherwise
+        if pdf_text is not None:
+            content = [
+                {
+                    "type": "text",
+                    "text": prompt + "\n\nAnalyze the following discharge summary text:\n\n" + pdf_text
+                }
+            ]
+        else:
+            content = [
+                {
+                    "type": "text",
+                    "text": prompt + "\n\nAnalyze the following discharge summary images:"
+                }
+            ]
+
+            # Compress and encode all pages in a thread pool - the CPU-bound
+            # work runs off the event loop and in parallel across pages
+            image_parts = await asyncio.gather(
+                *(asyncio.to_thread(_encode_image_part, img_bytes) for img_bytes in image_bytes_list)
+            )
+            content.extend(image_parts)
         
         # Prepare request payload
         payload = {
@@ -514,16 +702,21 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
         logger.info(f"Using OpenRouter API with model: {model}")
         logger.info("Sending images to vision model for parsing")
         
-        # Make async HTTP request to OpenRouter
+        # Make async HTTP request to OpenRouter via the shared keep-alive client.
+        # The payload is serialized with orjson instead of httpx's stdlib json
+        # encoder - with megabytes of base64 image data this saves hundreds of
+        # ms of pre-send CPU per request.
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    url="https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                response_data = response.json()
+            client = get_openrouter_client()
+            response = await client.post(
+                url="https://openrouter.ai/api/v1/chat/completions",
+                headers=headers,
+                content=orjson.dumps(payload)
+            )
+            response.raise_for_status()
+            # Parse the envelope straight from the response bytes with orjson
+            # (single pass, no intermediate text decode via response.json())
+            response_data = orjson.loads(response.content)
         except httpx.HTTPStatusError as e:
             error_detail = "Unknown error"
             try:
@@ -556,9 +749,14 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
         logger.info(f"Vision model response received: {len(response_text)} characters")
         logger.debug(f"Response preview: {response_text[:200]}...")
         
-        # Parse JSON response using robust parser
+        # Parse JSON response - fast path: the model usually returns clean JSON,
+        # so try a direct orjson parse first and only fall back to the robust
+        # (regex-scrubbing) parser when that fails
         try:
-            parsed_json = robust_json_parse(response_text)
+            try:
+                parsed_json = orjson.loads(response_text)
+            except orjson.JSONDecodeError:
+                parsed_json = robust_json_parse(response_text)
             logger.info("Successfully parsed AI response to JSON")
         except HTTPException:
             # Re-raise HTTP exceptions from robust_json_parse
@@ -571,36 +769,49 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
                 detail=f"Failed to parse AI response: {str(e)}"
             )
         
+        # Kick off action plan PDF generation early - the Cloudinary upload is
+        # pure I/O and overlaps with the medication/followup assembly below
+        action_plan_text = parsed_json.get("action_plan")
+        pdf_task = None
+        if action_plan_text:
+            patient_name_for_pdf = parsed_json.get("patient_name") or "Unknown_Patient"
+            logger.info("Generating action plan PDF...")
+            pdf_task = asyncio.create_task(generate_action_plan_pdf(action_plan_text, patient_name_for_pdf))
+
         # Convert JSON to Pydantic model
         try:
             medications = []
             for med_data in parsed_json.get("medications", []):
+                # Bind all fields once per medication instead of scattered .get() calls
+                raw_name = med_data.get("name")
+                raw_dosage = med_data.get("dosage")
+                raw_start_date = med_data.get("start_date")
+                raw_end_date = med_data.get("end_date")
+                timing_data = med_data.get("timing", [])
+                raw_days = med_data.get("days", [])
+                raw_frequency = med_data.get("frequency")
+                raw_status = med_data.get("status")
+
                 start_date = None
-                if med_data.get("start_date"):
+                if raw_start_date:
                     try:
-                        start_date = datetime.strptime(med_data["start_date"], "%Y-%m-%d").date()
+                        start_date = datetime.strptime(raw_start_date, "%Y-%m-%d").date()
                     except (ValueError, TypeError):
                         pass
-                
+
                 end_date = None
-                if med_data.get("end_date"):
+                if raw_end_date:
                     try:
-                        end_date = datetime.strptime(med_data["end_date"], "%Y-%m-%d").date()
+                        end_date = datetime.strptime(raw_end_date, "%Y-%m-%d").date()
                     except (ValueError, TypeError):
                         pass
-                
+
                 # Parse frequency first (needed for timing defaults)
-                frequency = FrequencyEnum.DAILY
-                if med_data.get("frequency"):
-                    try:
-                        frequency = FrequencyEnum(med_data["frequency"].lower())
-                    except ValueError:
-                        pass
-                
+                frequency = _FREQUENCY_MAP.get((raw_frequency or "").lower(), FrequencyEnum.DAILY)
+
                 # Parse timing - accept time strings directly (keep as time strings, not full ISO datetime)
                 timing = []
-                timing_data = med_data.get("timing", [])
-                
+
                 if timing_data:
                     # If AI provided timing, keep as time strings (e.g., "10:00AM", "6:00PM")
                     # These will be converted to full ISO 8601 format when creating reminders
@@ -608,30 +819,13 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
                         if t and isinstance(t, str):
                             timing.append(t.strip())
                 
-                # If no timing provided, apply defaults based on frequency or instructions
-                if not timing:
-                    # Check frequency field
-                    frequency_str = med_data.get("frequency", "").lower() if isinstance(med_data.get("frequency"), str) else ""
-                    
-                    # Check medication name and dosage for "twice daily" indicators
-                    name_str = (med_data.get("name") or "").lower()
-                    dosage_str = (med_data.get("dosage") or "").lower()
-                    combined_text = f"{name_str} {dosage_str} {frequency_str}".lower()
-                    
-                
                 days = []
-                for d in med_data.get("days", []):
-                    try:
-                        days.append(DayEnum(d.lower()))
-                    except ValueError:
-                        pass
-                
-                status_val = MedicationStatus.ACTIVE
-                if med_data.get("status"):
-                    try:
-                        status_val = MedicationStatus(med_data["status"].lower())
-                    except ValueError:
-                        pass
+                for d in raw_days:
+                    day_enum = _DAY_MAP.get(d.lower())
+                    if day_enum is not None:
+                        days.append(day_enum)
+
+                status_val = _STATUS_MAP.get((raw_status or "").lower(), MedicationStatus.ACTIVE)
                 
                 # Generate reminders for this medication
                 reminders = generate_reminders(
@@ -642,9 +836,10 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
                     end_date=end_date,
                 )
                 
-                medication = MedicationDetail(
-                    name=med_data.get("name") or "Unknown",
-                    dosage=med_data.get("dosage") or "Not specified",
+                # Fields are coerced above, so skip Pydantic validation
+                medication = MedicationDetail.model_construct(
+                    name=raw_name or "Unknown",
+                    dosage=raw_dosage or "Not specified",
                     start_date=start_date,
                     end_date=end_date,
                     timing=timing,
@@ -668,24 +863,24 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
             followup_data_list = parsed_json.get("appointment_followup", [])
             for followup_data in followup_data_list:
                 try:
+                    # Bind fields once per followup, as in the medications loop
+                    raw_followup_date = followup_data.get("followup_date")
+
                     followup_date = None
-                    if followup_data.get("followup_date"):
+                    if raw_followup_date:
                         try:
-                            followup_date = datetime.strptime(followup_data["followup_date"], "%Y-%m-%d").date()
+                            followup_date = datetime.strptime(raw_followup_date, "%Y-%m-%d").date()
                         except (ValueError, TypeError):
-                            logger.warning(f"Invalid followup_date format: {followup_data.get('followup_date')}")
+                            logger.warning(f"Invalid followup_date format: {raw_followup_date}")
                             continue
                     
                     if followup_date is None:
                         continue
                     
                     # Parse status
-                    status_val = FollowupStatus.NOT_CONFIRMED
-                    if followup_data.get("status"):
-                        try:
-                            status_val = FollowupStatus(followup_data["status"].lower())
-                        except ValueError:
-                            pass
+                    status_val = _FOLLOWUP_STATUS_MAP.get(
+                        (followup_data.get("status") or "").lower(), FollowupStatus.NOT_CONFIRMED
+                    )
                     
                     followup = Followup(
                         followup_date=followup_date,
@@ -700,14 +895,11 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
                     logger.warning(f"Error parsing followup: {str(e)}")
                     continue
             
-            # Generate action plan PDF if action_plan exists
+            # Collect the action plan PDF started before the assembly loops
             action_plan_pdf_url = None
-            action_plan_text = parsed_json.get("action_plan")
-            if action_plan_text:
+            if pdf_task is not None:
                 try:
-                    patient_name_for_pdf = parsed_json.get("patient_name") or "Unknown_Patient"
-                    logger.info("Generating action plan PDF...")
-                    action_plan_pdf_url = await generate_action_plan_pdf(action_plan_text, patient_name_for_pdf)
+                    action_plan_pdf_url = await pdf_task
                     if action_plan_pdf_url:
                         logger.info(f"Action plan PDF generated and uploaded: {action_plan_pdf_url}")
                 except Exception as e:
@@ -726,6 +918,8 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
                 appointment_followup=appointment_followups,
             )
             
+            _PARSE_CACHE[cache_key] = result.model_dump_json()
+
             logger.info(f"Successfully parsed discharge summary with {len(result.medications)} medications and {len(result.appointment_followup)} appointment followups")
             return result
             
@@ -744,3 +938,34 @@ async def parse_discharge_summary_with_vision(image_bytes_list: list[bytes], mod
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse discharge summary with vision: {str(e)}"
         )
+
+
+async def parse_discharge_summaries_batch(
+    summaries: list[list[bytes]],
+    model: str = "google/gemini-2.5-pro",
+    concurrency: int = 8,
+) -> list[DischargeSummaryParsed | Exception]:
+    """
+    Parse multiple discharge summaries concurrently.
+
+    Each entry in summaries is the list of page images for one document. The
+    LLM calls run in parallel under a semaphore so a large batch stays within
+    OpenRouter rate limits, and a failed document is returned as its exception
+    instead of cancelling the rest of the batch.
+
+    Args:
+        summaries: List of documents, each a list of page image bytes
+        model: AI model to use for parsing
+        concurrency: Maximum number of in-flight LLM requests
+
+    Returns:
+        List of DischargeSummaryParsed results (or the raised exception for
+        documents that failed), in the same order as the input
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _parse_one(image_bytes_list: list[bytes]) -> DischargeSummaryParsed:
+        async with semaphore:
+            return await parse_discharge_summary_with_vision(image_bytes_list, model=model)
+
+    return await asyncio.gather(*(_parse_one(s) for s in summaries), return_exceptions=True)
@@ -1,18 +1,41 @@
 """Service for generating insurer justification documents using AI/LLM."""
 
+import hashlib
 import logging
 import json
 import os
 import re
+from string import Template
 from typing import Optional, Dict, Any, List
 from fastapi import HTTPException, status
 import httpx
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
+from app.config.http_client import get_openrouter_client
 from app.utils.pdf_service import convert_markdown_to_pdf
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Resolved once at import - avoids re-reading and re-parsing .env from disk
+# on requests where the per-call os.getenv fallback used to kick in
+_API_KEY = os.getenv("OPEN_ROUTER_API_KEY", "").strip()
+
+# Response-level cache: identical inputs (retries, duplicate submissions)
+# return the already-uploaded Cloudinary URL instead of paying another
+# LLM call plus PDF generation and upload
+_JUSTIFICATION_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+# Matches a response fully wrapped in a markdown code fence; group 1 is the
+# document body. Anchored so a single match replaces the split("```") pass
+# that allocated every segment of the response
+_MD_FENCE_RE = re.compile(r'^```(?:markdown)?\s*\n?(.*?)\n?```\s*$', re.DOTALL)
+
+# Translation table built once at import - strips currency symbols, thousands
+# separators and whitespace in a single C-level scan per bill value
+_CURRENCY_STRIP_TABLE = str.maketrans('', '', '$€£¥₹, \t\n')
+
 
 def parse_currency_to_float(value: Any) -> float:
     """
@@ -39,21 +62,18 @@ def parse_currency_to_float(value: Any) -> float:
     if isinstance(value, (int, float)):
         return float(value)
     
-    # If not a string, try to convert
+    # Fast path: plain numeric strings (the common case) and any other type
+    # float() accepts parse directly without the cleanup pass
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        pass
+
     if not isinstance(value, str):
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
-    
-    # Clean the string: remove whitespace, dollar signs, and other currency symbols
-    cleaned = value.strip()
-    
-    # Remove currency symbols ($, €, £, etc.)
-    cleaned = re.sub(r'[$€£¥₹]', '', cleaned)
-    
-    # Remove commas (thousands separators)
-    cleaned = cleaned.replace(',', '')
+        return 0.0
+
+    # Clean the string: strip currency symbols, commas, and whitespace in one pass
+    cleaned = value.translate(_CURRENCY_STRIP_TABLE)
     
     # Try to parse as float
     try:
@@ -63,96 +83,14 @@ def parse_currency_to_float(value: Any) -> float:
         return 0.0
 
 
-def get_justification_document_prompt(
-    patient_name: str,
-    medical_condition: str,
-    admission_date: str,
-    discharge_date: Optional[str],
-    age: int,
-    gender: str,
-    assigned_doctor: str,
-    medication_details: Dict[str, Any],
-    bill_details: List[Dict[str, Any]],
-    reports: List[Dict[str, Any]],
-    doctor_notes: str,
-) -> str:
-    """Generate the justification document prompt with patient context."""
-    
-    # Format medication details
-    medications_text = ""
-    if medication_details and medication_details.get("medications"):
-        medications_list = []
-        for med in medication_details.get("medications", []):
-            med_text = f"- {med.get('name', 'Unknown')} ({med.get('dosage', 'N/A')})"
-            if med.get('frequency'):
-                med_text += f" - Frequency: {med.get('frequency')}"
-            medications_list.append(med_text)
-        medications_text = "\n".join(medications_list) if medications_list else "None specified"
-    else:
-        medications_text = "None specified"
-    
-    # Format bill details
-    bills_text = ""
-    if bill_details:
-        bills_list = []
-        total_cost = 0
-        for bill in bill_details:
-            bill_name = bill.get("name", "Unknown Bill")
-            bill_total = bill.get("total", 0)
-            # Use robust currency parser to handle formats like '$2,180'
-            total_cost += parse_currency_to_float(bill_total)
-            details = bill.get("details", [])
-            details_text = "\n    ".join([f"- {d.get('name', 'N/A')}: ${d.get('cost', '0')}" for d in details])
-            bills_list.append(f"  **{bill_name}**\n    Total: ${bill_total}\n    Items:\n    {details_text}")
-        bills_text = "\n\n".join(bills_list) if bills_list else "No bills provided"
-        bills_text += f"\n\n**Total Medical Costs: ${total_cost:.2f}**"
-    else:
-        bills_text = "No bills provided"
-    
-    # Format reports
-    reports_text = ""
-    if reports:
-        reports_list = []
-        for report in reports:
-            report_name = report.get("name", "Unknown Report")
-            reason = report.get("reason", "Not specified")
-            biomarkers = report.get("biomarkers", [])
-            biomarkers_text = "\n    ".join([
-                f"- {b.get('name', 'N/A')}: {b.get('value', 'N/A')} (Range: {b.get('range', 'N/A')})"
-                for b in biomarkers
-            ])
-            reports_list.append(f"  **{report_name}**\n    Reason: {reason}\n    Results:\n    {biomarkers_text}")
-        reports_text = "\n\n".join(reports_list) if reports_list else "No reports provided"
-    else:
-        reports_text = "No reports provided"
-    
-    discharge_date_text = discharge_date if discharge_date else "Not yet discharged"
-    
-    return f"""
+# Static instructional scaffold, identical across every justification request.
+# Sent as its own content block with cache_control so Anthropic caches the
+# ~1-2k token instructions server-side; only the patient context below it is
+# re-billed at the full input rate. Cached blocks must precede dynamic ones.
+_JUSTIFICATION_STATIC_PROMPT = """
 You are a medical documentation specialist tasked with creating a comprehensive justification document for insurance claims.
 
-Your task is to create a clear, professional, and detailed justification document that explains why all medical treatments, procedures, medications, and services were medically necessary for the patient.
-
-**PATIENT INFORMATION:**
-- Name: {patient_name}
-- Age: {age}
-- Gender: {gender}
-- Medical Condition: {medical_condition}
-- Assigned Doctor: {assigned_doctor}
-- Admission Date: {admission_date}
-- Discharge Date: {discharge_date_text}
-
-**MEDICATIONS PRESCRIBED:**
-{medications_text}
-
-**MEDICAL BILLS AND COSTS:**
-{bills_text}
-
-**MEDICAL REPORTS AND TEST RESULTS:**
-{reports_text}
-
-**DOCTOR'S NOTES:**
-{doctor_notes if doctor_notes else "No additional notes provided"}
+Your task is to create a clear, professional, and detailed justification document that explains why all medical treatments, procedures, medications, and services were medically necessary for the patient. The patient's information follows in the next message block.
 
 **YOUR TASK:**
 Create a comprehensive justification document in markdown format that:
@@ -201,6 +139,108 @@ Start directly with the title: "# Insurance Claim Justification Document"
 """
 
 
+# Pre-parsed once at import; substitute() assembles the patient context from
+# the cached segments instead of rebuilding the interpolation chain per call
+_PATIENT_CONTEXT_TEMPLATE = Template("""
+**PATIENT INFORMATION:**
+- Name: ${patient_name}
+- Age: ${age}
+- Gender: ${gender}
+- Medical Condition: ${medical_condition}
+- Assigned Doctor: ${assigned_doctor}
+- Admission Date: ${admission_date}
+- Discharge Date: ${discharge_date_text}
+
+**MEDICATIONS PRESCRIBED:**
+${medications_text}
+
+**MEDICAL BILLS AND COSTS:**
+${bills_text}
+
+**MEDICAL REPORTS AND TEST RESULTS:**
+${reports_text}
+
+**DOCTOR'S NOTES:**
+${doctor_notes}
+""")
+
+
+def _format_medication(med: Dict[str, Any]) -> str:
+    """Format one medication entry for the justification prompt."""
+    med_text = f"- {med.get('name', 'Unknown')} ({med.get('dosage', 'N/A')})"
+    frequency = med.get('frequency')
+    if frequency:
+        med_text += f" - Frequency: {frequency}"
+    return med_text
+
+
+def _format_bill(bill: Dict[str, Any]) -> str:
+    """Format one bill with its line items for the justification prompt."""
+    details_text = "\n    ".join(f"- {d.get('name', 'N/A')}: ${d.get('cost', '0')}" for d in bill.get("details", []))
+    return f"  **{bill.get('name', 'Unknown Bill')}**\n    Total: ${bill.get('total', 0)}\n    Items:\n    {details_text}"
+
+
+def _format_report(report: Dict[str, Any]) -> str:
+    """Format one report with its biomarkers for the justification prompt."""
+    biomarkers_text = "\n    ".join(
+        f"- {b.get('name', 'N/A')}: {b.get('value', 'N/A')} (Range: {b.get('range', 'N/A')})"
+        for b in report.get("biomarkers", [])
+    )
+    return f"  **{report.get('name', 'Unknown Report')}**\n    Reason: {report.get('reason', 'Not specified')}\n    Results:\n    {biomarkers_text}"
+
+
+def get_justification_document_prompt(
+    patient_name: str,
+    medical_condition: str,
+    admission_date: str,
+    discharge_date: Optional[str],
+    age: int,
+    gender: str,
+    assigned_doctor: str,
+    medication_details: Dict[str, Any],
+    bill_details: List[Dict[str, Any]],
+    reports: List[Dict[str, Any]],
+    doctor_notes: str,
+) -> str:
+    """Generate the patient-specific context block of the justification prompt.
+
+    The static task instructions live in _JUSTIFICATION_STATIC_PROMPT; this
+    returns only the per-patient data that cannot be prompt-cached.
+    """
+    
+    # Format medication details - single generator pass, no intermediate list
+    medications = medication_details.get("medications") if medication_details else None
+    medications_text = "\n".join(_format_medication(med) for med in medications) if medications else "None specified"
+
+    # Format bill details; total is a separate single-pass sum with the robust
+    # currency parser to handle formats like '$2,180'
+    if bill_details:
+        total_cost = sum(parse_currency_to_float(bill.get("total", 0)) for bill in bill_details)
+        bills_text = "\n\n".join(_format_bill(bill) for bill in bill_details)
+        bills_text += f"\n\n**Total Medical Costs: ${total_cost:.2f}**"
+    else:
+        bills_text = "No bills provided"
+
+    # Format reports
+    reports_text = "\n\n".join(_format_report(report) for report in reports) if reports else "No reports provided"
+    
+    discharge_date_text = discharge_date if discharge_date else "Not yet discharged"
+
+    return _PATIENT_CONTEXT_TEMPLATE.substitute(
+        patient_name=patient_name,
+        age=age,
+        gender=gender,
+        medical_condition=medical_condition,
+        assigned_doctor=assigned_doctor,
+        admission_date=admission_date,
+        discharge_date_text=discharge_date_text,
+        medications_text=medications_text,
+        bills_text=bills_text,
+        reports_text=reports_text,
+        doctor_notes=doctor_notes if doctor_notes else "No additional notes provided",
+    )
+
+
 async def generate_insurer_justification_document(
     patient_name: str,
     medical_condition: str,
@@ -237,22 +277,44 @@ async def generate_insurer_justification_document(
     """
     try:
         logger.info(f"Generating insurer justification document for patient: {patient_name}")
-        
-        # Get API key from environment
-        api_key = os.getenv("OPEN_ROUTER_API_KEY")
-        if not api_key:
-            load_dotenv(override=True)
-            api_key = os.getenv("OPEN_ROUTER_API_KEY")
-        
+
+        # Check the response cache - a hash hit means we already generated and
+        # uploaded a PDF for this exact input, so return its URL directly
+        cache_key = hashlib.blake2b(
+            orjson.dumps(
+                {
+                    "patient_name": patient_name,
+                    "medical_condition": medical_condition,
+                    "admission_date": admission_date,
+                    "discharge_date": discharge_date,
+                    "age": age,
+                    "gender": gender,
+                    "assigned_doctor": assigned_doctor,
+                    "medication_details": medication_details,
+                    "bill_details": bill_details,
+                    "reports": reports,
+                    "doctor_notes": doctor_notes,
+                    "model": model,
+                },
+                option=orjson.OPT_SORT_KEYS,
+                default=str,
+            ),
+            digest_size=16,
+        ).hexdigest()
+        cached_url = _JUSTIFICATION_CACHE.get(cache_key)
+        if cached_url is not None:
+            logger.info(f"Returning cached justification PDF for patient: {patient_name}")
+            return cached_url
+
+        # API key is resolved once at import time
+        api_key = _API_KEY
         if not api_key:
             logger.error("OPEN_ROUTER_API_KEY environment variable is not set")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="OPEN_ROUTER_API_KEY environment variable is not set. Please check your .env file."
             )
-        
-        api_key = api_key.strip()
-        
+
         # Generate prompt
         prompt = get_justification_document_prompt(
             patient_name=patient_name,
@@ -268,20 +330,39 @@ async def generate_insurer_justification_document(
             doctor_notes=doctor_notes,
         )
         
-        # Prepare request payload
+        # Prepare request payload. The system message and static task
+        # instructions carry cache_control so Anthropic serves them from its
+        # prompt cache on repeat calls; only the patient context is uncached.
         payload = {
             "model": model,
             "messages": [
                 {
                     "role": "system",
-                    "content": "You are a medical documentation specialist who creates clear, comprehensive justification documents for insurance claims. Your documents help reduce claim denials by providing detailed medical necessity explanations."
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": "You are a medical documentation specialist who creates clear, comprehensive justification documents for insurance claims. Your documents help reduce claim denials by providing detailed medical necessity explanations.",
+                            "cache_control": {"type": "ephemeral"}
+                        }
+                    ]
                 },
                 {
                     "role": "user",
-                    "content": prompt
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": _JUSTIFICATION_STATIC_PROMPT,
+                            "cache_control": {"type": "ephemeral"}
+                        },
+                        {
+                            "type": "text",
+                            "text": prompt
+                        }
+                    ]
                 }
             ],
             "temperature": 0.3,  # Lower temperature for more consistent, factual output
+            "stream": True,  # SSE streaming - start receiving tokens as they are generated
         }
         
         # Prepare headers
@@ -295,16 +376,36 @@ async def generate_insurer_justification_document(
         logger.info(f"Using OpenRouter API with model: {model}")
         logger.info("Sending request to generate justification document")
         
-        # Make async HTTP request to OpenRouter
+        # Stream the completion over SSE via the shared client. Tokens are
+        # consumed as Anthropic generates them instead of holding the whole
+        # response in OpenRouter's buffer, so markdown accumulation (and the
+        # PDF step after it) starts as soon as the last token arrives.
         try:
-            async with httpx.AsyncClient(timeout=180.0) as client:  # Longer timeout for complex documents
-                response = await client.post(
-                    url="https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                response_data = response.json()
+            client = get_openrouter_client()
+            chunks = []
+            async with client.stream(
+                "POST",
+                url="https://openrouter.ai/api/v1/chat/completions",
+                headers=headers,
+                content=orjson.dumps(payload),
+                timeout=180.0,  # Longer timeout for complex documents
+            ) as response:
+                if response.status_code >= 400:
+                    # Body must be read before raise_for_status on a stream
+                    await response.aread()
+                    response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[6:]
+                    if data == "[DONE]":
+                        break
+                    try:
+                        delta = orjson.loads(data)["choices"][0]["delta"].get("content")
+                    except (orjson.JSONDecodeError, KeyError, IndexError):
+                        continue
+                    if delta:
+                        chunks.append(delta)
         except httpx.HTTPStatusError as e:
             error_detail = "Unknown error"
             try:
@@ -323,12 +424,10 @@ async def generate_insurer_justification_document(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to connect to OpenRouter API: {str(e)}"
             )
-        
-        # Extract response text
-        try:
-            response_text = response_data["choices"][0]["message"]["content"].strip()
-        except (KeyError, IndexError) as e:
-            logger.error(f"Invalid response format from OpenRouter: {response_data}")
+
+        response_text = "".join(chunks).strip()
+        if not response_text:
+            logger.error("Empty streamed response from OpenRouter")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Invalid response format from OpenRouter API"
@@ -338,11 +437,9 @@ async def generate_insurer_justification_document(
         logger.debug(f"Response preview: {response_text[:200]}...")
         
         # Clean up markdown if it's wrapped in code blocks
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("markdown"):
-                response_text = response_text[7:]
-            response_text = response_text.strip()
+        fence_match = _MD_FENCE_RE.match(response_text)
+        if fence_match:
+            response_text = fence_match.group(1).strip()
         
         # Generate PDF from markdown
         logger.info("Converting markdown to PDF...")
@@ -350,6 +447,7 @@ async def generate_insurer_justification_document(
             pdf_url = await convert_markdown_to_pdf(response_text, patient_name, "justifications")
             if pdf_url:
                 logger.info(f"Insurer justification PDF generated and uploaded: {pdf_url}")
+                _JUSTIFICATION_CACHE[cache_key] = pdf_url
                 return pdf_url
             else:
                 logger.warning("PDF generation returned None")
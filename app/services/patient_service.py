@@ -1,66 +1,58 @@
 """Patient service for business logic operations."""
 
 import logging
-from datetime import date, datetime
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 from app.config.supabase import get_supabase_client
-from app.schemas.patients import PatientCreate, PatientResponse
+from app.schemas.patients import PatientCreate, PatientResponse, PatientSummary
 
 logger = logging.getLogger(__name__)
 
-def serialize_dates_for_mongodb(data: dict) -> dict:
-    """Convert date objects to ISO format strings for database storage."""
-    for key, value in data.items():
-        if isinstance(value, (date, datetime)):
-            data[key] = value.isoformat()
-        elif isinstance(value, list):
-            serialized_list = []
-            for item in value:
-                if isinstance(item, (date, datetime)):
-                    serialized_list.append(item.isoformat())
-                elif isinstance(item, dict):
-                    # Handle nested dictionaries (e.g., Followup objects)
-                    serialized_item = serialize_dates_for_mongodb(item.copy())
-                    serialized_list.append(serialized_item)
-                else:
-                    serialized_list.append(item)
-            data[key] = serialized_list
-        elif isinstance(value, dict):
-            # Recursively handle nested dictionaries
-            data[key] = serialize_dates_for_mongodb(value)
-    return data
+# Built once at import - validates the whole result set in a single
+# C-level pass instead of N per-row PatientResponse(**row) constructions
+_PATIENTS_ADAPTER = TypeAdapter(list[PatientResponse])
+
+# Defaults applied to optional insert columns, hoisted so the dict isn't
+# rebuilt literal-by-literal on every create. List-valued defaults are kept
+# as tuples and converted at use so rows never alias one shared list.
+_PATIENT_DEFAULTS = {
+    "bill_details": (),
+    "reports": (),
+    "doctor_notes": "",
+    "doctor_medical_certificate": "",
+    "messages": (),
+    "conversation_summary": "",
+    "appointment_followup": (),
+    "telegram_chat_id": None,
+}
+
+# Columns fetched for list views - the heavy JSONB columns (bill_details,
+# reports, messages, medication_details) stay in the database
+_SUMMARY_COLUMNS = "id,patient_name,age,gender,medical_condition,assigned_doctor,admission_date,discharge_date,created_at"
+
+def _prepare_patient_dict(patient: PatientCreate) -> dict:
+    """Dump a patient model to an insert-ready dict with defaults applied."""
+    # Dump in JSON mode so Pydantic's C-level serializer emits ISO date
+    # strings directly - no Python-level post-processing pass needed
+    patient_dict = patient.model_dump(mode="json")
+
+    # Set default values for optional fields if not provided
+    for key, default_value in _PATIENT_DEFAULTS.items():
+        if patient_dict.get(key) is None:
+            patient_dict[key] = list(default_value) if isinstance(default_value, tuple) else default_value
+
+    return patient_dict
+
 
 async def create_patient(patient: PatientCreate) -> PatientResponse:
     """Create a new patient record in the database."""
     try:
         logger.info(f"Starting patient creation for: {patient.patient_name}")
-        
-        # Convert Pydantic model to dict
+
         logger.debug("Converting Pydantic model to dict")
-        patient_dict = patient.model_dump()
+        patient_dict = _prepare_patient_dict(patient)
         logger.debug(f"Patient dict keys: {list(patient_dict.keys())}")
-        
-        # Set default values for optional fields if not provided
-        defaults = {
-            "bill_details": [],
-            "reports": [],
-            "doctor_notes": "",
-            "doctor_medical_certificate": "",
-            "messages": [],
-            "conversation_summary": "",
-            "appointment_followup": [],
-            "telegram_chat_id": None,
-        }
-        
-        for key, default_value in defaults.items():
-            if patient_dict.get(key) is None:
-                logger.debug(f"Setting default value for {key}: {default_value}")
-                patient_dict[key] = default_value
-        
-        # Convert date objects to datetime for MongoDB
-        logger.debug("Serializing dates for MongoDB")
-        patient_dict = serialize_dates_for_mongodb(patient_dict)
-        
+
         # Insert patient into Supabase
         logger.info("Inserting patient into Supabase")
         supabase = get_supabase_client()
@@ -75,12 +67,15 @@ async def create_patient(patient: PatientCreate) -> PatientResponse:
         
         created_patient = result.data[0]
         logger.info(f"Patient inserted with ID: {created_patient.get('id')}")
-        
-        # Map 'id' to '_id' for PatientResponse compatibility
-        created_patient["_id"] = created_patient.get("id")
-        
+
+        # The row is the data we just validated and wrote plus DB-generated
+        # columns, so skip Pydantic's second full validation pass.
+        # model_construct works on field names, not aliases, so set 'id'
+        # directly instead of mapping it to '_id'.
+        created_patient["id"] = str(created_patient["id"])
+
         logger.info("Creating PatientResponse object")
-        response = PatientResponse(**created_patient)
+        response = PatientResponse.model_construct(**created_patient)
         logger.info(f"Patient created successfully: {response.id}")
         return response
         
@@ -95,32 +90,140 @@ async def create_patient(patient: PatientCreate) -> PatientResponse:
         )
 
 
-async def get_all_patients() -> list[PatientResponse]:
-    """Get all patient records from the database."""
+async def create_patients_bulk(patients: list[PatientCreate]) -> list[PatientResponse]:
+    """Create multiple patient records with a single bulk insert.
+
+    Supabase accepts a list of rows natively, so N patients cost one
+    round trip instead of N sequential inserts.
+    """
+    if not patients:
+        return []
+
     try:
-        logger.info("Fetching all patients from database")
-        
+        logger.info(f"Starting bulk patient creation for {len(patients)} patients")
+
+        patient_dicts = [_prepare_patient_dict(patient) for patient in patients]
+
         supabase = get_supabase_client()
-        result = supabase.table("patients").select("*").execute()
-        
+        result = supabase.table("patients").insert(patient_dicts).execute()
+
+        if not result.data or len(result.data) != len(patient_dicts):
+            logger.error(f"Bulk insert returned {len(result.data or [])} rows for {len(patient_dicts)} patients")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create patients in bulk"
+            )
+
+        responses = []
+        for created_patient in result.data:
+            # Rows were just written from validated input - skip re-validation
+            created_patient["id"] = str(created_patient["id"])
+            responses.append(PatientResponse.model_construct(**created_patient))
+
+        logger.info(f"Bulk created {len(responses)} patients")
+        return responses
+
+    except HTTPException:
+        logger.error("HTTPException in create_patients_bulk", exc_info=True)
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in create_patients_bulk: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create patients in bulk: {str(e)}"
+        )
+
+
+async def get_patients_summary(limit: int = 100, offset: int = 0) -> list[PatientSummary]:
+    """Get a paginated, lightweight listing of patients.
+
+    Fetches only the summary columns, so the multi-MB JSONB payloads never
+    leave the database for list views.
+    """
+    try:
+        logger.info(f"Fetching patient summaries (limit={limit}, offset={offset})")
+
+        supabase = get_supabase_client()
+        result = (
+            supabase.table("patients")
+            .select(_SUMMARY_COLUMNS)
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+
         if not result.data:
             logger.info("No patients found in database")
             return []
-        
-        logger.info(f"Found {len(result.data)} patients")
-        
-        # Convert each patient to PatientResponse
-        patients = []
+
+        summaries = []
         for patient_data in result.data:
-            # Map 'id' to '_id' for PatientResponse compatibility
-            patient_data["_id"] = patient_data.get("id")
+            patient_data["id"] = str(patient_data.get("id"))
             try:
-                patient = PatientResponse(**patient_data)
-                patients.append(patient)
+                summaries.append(PatientSummary(**patient_data))
             except Exception as e:
-                logger.warning(f"Failed to parse patient {patient_data.get('id')}: {str(e)}")
+                logger.warning(f"Failed to parse patient summary {patient_data.get('id')}: {str(e)}")
                 continue
+
+        logger.info(f"Successfully retrieved {len(summaries)} patient summaries")
+        return summaries
+
+    except Exception as e:
+        logger.error(f"Error fetching patient summaries: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch patients: {str(e)}"
+        )
+
+
+async def get_patient(patient_id: str) -> PatientResponse:
+    """Get one patient record with all columns."""
+    try:
+        logger.info(f"Fetching patient {patient_id}")
+
+        supabase = get_supabase_client()
+        result = supabase.table("patients").select("*").eq("id", patient_id).limit(1).execute()
+
+        if not result.data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Patient not found"
+            )
+
+        patient_data = result.data[0]
+        # Map 'id' to '_id' for PatientResponse compatibility
+        patient_data["_id"] = patient_data.get("id")
+        return PatientResponse(**patient_data)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching patient {patient_id}: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch patient: {str(e)}"
+        )
+
+
+async def get_all_patients(limit: int = 100, offset: int = 0) -> list[PatientResponse]:
+    """Get patient records from the database, paginated."""
+    try:
+        logger.info(f"Fetching patients from database (limit={limit}, offset={offset})")
+
+        supabase = get_supabase_client()
+        result = supabase.table("patients").select("*").range(offset, offset + limit - 1).execute()
+        
+        if not result.data:
+            logger.info("No patients found in database")
+            return []
         
+        logger.info(f"Found {len(result.data)} patients")
+
+        # Map 'id' to '_id' for PatientResponse compatibility, then validate
+        # the whole batch in one pass via the module-level TypeAdapter
+        for patient_data in result.data:
+            patient_data["_id"] = patient_data.get("id")
+        patients = _PATIENTS_ADAPTER.validate_python(result.data)
+
         logger.info(f"Successfully retrieved {len(patients)} patients")
         return patients
         
@@ -1,32 +1,62 @@
 """Service for parsing medical reports using AI/LLM."""
 
+import asyncio
+import functools
+import hashlib
 import logging
 import json
 import os
-import base64
+import pybase64
 from typing import Optional, List, Dict, Any
 from fastapi import HTTPException, status
 import httpx
+import orjson
+from cachetools import LRUCache
 from dotenv import load_dotenv
+from app.config.http_client import get_openrouter_client
 from app.schemas.reports import ReportParsed, Biomarker
+from app.utils.cloudinary_service import upload_image_bytes
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# When enabled (default), page images are uploaded to Cloudinary in parallel
+# and referenced by URL in the OpenRouter payload instead of being inlined as
+# base64 data URLs - the request body shrinks >4x and the encode CPU goes
+# away. Set REPORT_IMAGES_AS_URLS=false to fall back to inline base64.
+_USE_IMAGE_URLS = os.getenv("REPORT_IMAGES_AS_URLS", "true").strip().lower() == "true"
+
+# Static data-URL prefix - concatenated as bytes before a single ASCII decode
+# so a multi-MB payload is copied once, not twice
+_JPEG_DATA_URL_PREFIX = b"data:image/jpeg;base64,"
+
+# Content-addressed cache of parsed reports, keyed on image bytes + prompt +
+# model. Re-uploads of the same lab PDF skip the whole vision round trip.
+# Stored as serialized JSON so cached entries stay immutable.
+_REPORT_PARSE_CACHE: LRUCache = LRUCache(maxsize=256)
+
 
 def get_report_parsing_prompt(medications: List[Dict[str, Any]], diagnosis: Optional[str] = None) -> str:
-    """Generate the parsing prompt with medications and diagnosis context."""
-    
+    """Generate the parsing prompt with medications and diagnosis context.
+
+    Medication names are sorted into a stable order and the prompt is
+    memoized per (names, diagnosis) signature - identical across a
+    patient's pages and reparse attempts, and the byte-stable prefix lets
+    OpenRouter's automatic prompt cache kick in.
+    """
     # Build context from medications - only extract relevant medication names
-    medication_names = []
-    if medications:
-        for med in medications:
-            if isinstance(med, dict) and med.get("name"):
-                medication_names.append(med["name"])
-    
+    medication_names = tuple(sorted(
+        med["name"] for med in (medications or []) if isinstance(med, dict) and med.get("name")
+    ))
+    return _build_report_parsing_prompt(medication_names, diagnosis)
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_report_parsing_prompt(medication_names: tuple, diagnosis: Optional[str]) -> str:
+    """Render the ~2 KB prompt for a (medication names, diagnosis) signature."""
     medications_context = ", ".join(medication_names) if medication_names else "None"
     diagnosis_context = diagnosis if diagnosis else "Not specified"
-    
+
     return f"""
 You are a medical report parser specialized in extracting structured information from medical test reports.
 
@@ -69,9 +99,26 @@ IMPORTANT: Return ONLY a valid JSON object with this exact structure:
 Do not include any explanations, markdown formatting, or additional text. Return ONLY the JSON object.
 """
 
-async def parse_report_with_vision(image_bytes_list: list[bytes], medications: List[Dict[str, Any]] = None, diagnosis: Optional[str] = None, model: str = "google/gemini-2.5-pro") -> ReportParsed:
+
+def _encode_image_part(img_bytes: bytes) -> dict:
+    """Base64-encode one page image into a message content part.
+
+    Uses pybase64 (SIMD libbase64 kernels) - 2-5x faster than the stdlib
+    encoder on the multi-MB page images this path handles.
+    """
+    data_url = (_JPEG_DATA_URL_PREFIX + pybase64.b64encode(img_bytes)).decode('ascii')
+    return {
+        "type": "image_url",
+        "image_url": {"url": data_url}
+    }
+
+
+async def parse_report_with_vision(image_bytes_list: list[bytes], medications: List[Dict[str, Any]] = None, diagnosis: Optional[str] = None, model: str = "google/gemini-2.5-pro", pdf_text: Optional[str] = None) -> ReportParsed:
     try:
-        logger.info(f"Initializing vision model for parsing {len(image_bytes_list)} report images")
+        if pdf_text is not None:
+            logger.info("Initializing model for parsing report text (%d chars)", len(pdf_text))
+        else:
+            logger.info("Initializing vision model for parsing %d report images", len(image_bytes_list))
         
         # Get API key from environment
         api_key = os.getenv("OPEN_ROUTER_API_KEY")
@@ -94,21 +141,55 @@ async def parse_report_with_vision(image_bytes_list: list[bytes], medications: L
         
         # Prepare message content with images
         prompt = get_report_parsing_prompt(medications=meds_list, diagnosis=diagnosis)
-        content = [
-            {
-                "type": "text",
-                "text": prompt + "\n\nAnalyze the following medical report images:"
-            }
-        ]
-        
-        # Add all images as base64 encoded data URLs
-        for img_bytes in image_bytes_list:
-            base64_image = base64.b64encode(img_bytes).decode('utf-8')
-            data_url = f"data:image/png;base64,{base64_image}"
-            content.append({
-                "type": "image_url",
-                "image_url": {"url": data_url}
-            })
+
+        # Check the content-addressed cache. The prompt is part of the key, so
+        # different medication/diagnosis context (or a prompt edit) never
+        # reuses a stale parse.
+        hasher = hashlib.blake2b(digest_size=16)
+        if pdf_text is not None:
+            hasher.update(pdf_text.encode())
+        else:
+            for img_bytes in image_bytes_list:
+                hasher.update(img_bytes)
+        hasher.update(prompt.encode())
+        hasher.update(model.encode())
+        cache_key = hasher.digest()
+
+        cached_result = _REPORT_PARSE_CACHE.get(cache_key)
+        if cached_result is not None:
+            logger.info("Returning cached report parse for identical images")
+            return ReportParsed.model_validate_json(cached_result)
+
+        if pdf_text is not None:
+            # Born-digital PDF: send the extracted text layer directly, no
+            # uploads or image encoding needed
+            content = [
+                {
+                    "type": "text",
+                    "text": prompt + "\n\nAnalyze the following medical report text:\n\n" + pdf_text
+                }
+            ]
+        else:
+            content = [
+                {
+                    "type": "text",
+                    "text": prompt + "\n\nAnalyze the following medical report images:"
+                }
+            ]
+
+            if _USE_IMAGE_URLS:
+                # Upload all pages in parallel and reference them by URL
+                image_urls = await asyncio.gather(
+                    *(upload_image_bytes(img_bytes, "medicare/report_pages") for img_bytes in image_bytes_list)
+                )
+                content.extend({"type": "image_url", "image_url": {"url": url}} for url in image_urls)
+            else:
+                # Fallback: base64-encode all pages in a thread pool - the
+                # CPU-bound encoding runs off the event loop and in parallel
+                image_parts = await asyncio.gather(
+                    *(asyncio.to_thread(_encode_image_part, img_bytes) for img_bytes in image_bytes_list)
+                )
+                content.extend(image_parts)
         
         # Prepare request payload
         payload = {
@@ -133,19 +214,22 @@ async def parse_report_with_vision(image_bytes_list: list[bytes], medications: L
             "Content-Type": "application/json"
         }
         
-        logger.info(f"Using OpenRouter API with model: {model}")
+        logger.info("Using OpenRouter API with model: %s", model)
         logger.info("Sending report images to vision model for parsing")
         
-        # Make async HTTP request to OpenRouter
+        # Make async HTTP request to OpenRouter via the shared keep-alive
+        # client - reuses the warm TCP+TLS connection across vision calls
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    url="https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                response_data = response.json()
+            client = get_openrouter_client()
+            response = await client.post(
+                url="https://openrouter.ai/api/v1/chat/completions",
+                headers=headers,
+                content=orjson.dumps(payload)
+            )
+            response.raise_for_status()
+            # Parse the envelope straight from the response bytes with orjson
+            # (single pass, no intermediate text decode via response.json())
+            response_data = orjson.loads(response.content)
         except httpx.HTTPStatusError as e:
             error_detail = "Unknown error"
             try:
@@ -175,22 +259,23 @@ async def parse_report_with_vision(image_bytes_list: list[bytes], medications: L
                 detail="Invalid response format from OpenRouter API"
             )
         
-        logger.info(f"Vision model response received: {len(response_text)} characters")
-        logger.debug(f"Response preview: {response_text[:200]}...")
+        logger.info("Vision model response received: %d characters", len(response_text))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response preview: %s...", response_text[:200])
         
         # Parse JSON response
         try:
-            # Remove markdown code blocks if present
+            # Remove markdown code blocks if present (prefix/suffix strip avoids
+            # the list allocation of split("```") on large responses)
             if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
+                response_text = response_text[3:]
+                response_text = response_text.removeprefix("json").removeprefix("JSON")
+                response_text = response_text.removesuffix("```").strip()
             
-            parsed_json = json.loads(response_text)
+            parsed_json = orjson.loads(response_text)
             logger.info("Successfully parsed AI response to JSON")
-            
-        except json.JSONDecodeError as e:
+
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {str(e)}")
             logger.error(f"Response text: {response_text}")
             raise HTTPException(
@@ -198,25 +283,29 @@ async def parse_report_with_vision(image_bytes_list: list[bytes], medications: L
                 detail=f"AI returned invalid JSON: {str(e)}"
             )
         
-        # Convert JSON to Pydantic model
+        # Convert JSON to Pydantic model. Every field is normalized to a
+        # string right here, so model_construct skips a redundant validation
+        # pass - noticeable on reports with 20+ biomarkers (e.g. a CBC).
         try:
-            biomarkers = []
-            for biomarker_data in parsed_json.get("biomarkers", []):
-                biomarker = Biomarker(
-                    name=biomarker_data.get("name") or "Unknown",
-                    range=biomarker_data.get("range") or "Not specified",
-                    value=biomarker_data.get("value") or "Not specified"
+            biomarkers = [
+                Biomarker.model_construct(
+                    name=str(biomarker_data.get("name") or "Unknown"),
+                    range=str(biomarker_data.get("range") or "Not specified"),
+                    value=str(biomarker_data.get("value") or "Not specified")
                 )
-                biomarkers.append(biomarker)
-            
+                for biomarker_data in parsed_json.get("biomarkers", [])
+            ]
+
             # Create final parsed result
-            result = ReportParsed(
-                name=parsed_json.get("name") or "Medical Report",
-                reason=parsed_json.get("reason") or "Routine monitoring",
+            result = ReportParsed.model_construct(
+                name=str(parsed_json.get("name") or "Medical Report"),
+                reason=str(parsed_json.get("reason") or "Routine monitoring"),
                 biomarkers=biomarkers
             )
             
-            logger.info(f"Successfully parsed report: {result.name} with {len(result.biomarkers)} biomarkers")
+            _REPORT_PARSE_CACHE[cache_key] = result.model_dump_json()
+
+            logger.info("Successfully parsed report: %s with %d biomarkers", result.name, len(result.biomarkers))
             return result
             
         except Exception as e:
@@ -1,5 +1,7 @@
 """Cloudinary service for uploading files."""
 
+import asyncio
+import io
 import logging
 import os
 import cloudinary.uploader
@@ -9,6 +11,21 @@ import app.config.cloudinary  # Ensure Cloudinary is configured
 
 logger = logging.getLogger(__name__)
 
+# PDFs above this size go through Cloudinary's chunked upload_large API,
+# which streams 6 MB chunks over one keep-alive connection instead of a
+# single multi-MB request (Cloudinary recommends it above ~10 MB)
+_LARGE_UPLOAD_THRESHOLD_BYTES = 10 * 1024 * 1024
+_LARGE_UPLOAD_CHUNK_BYTES = 6 * 1024 * 1024
+
+
+def upload_pdf_bytes_sync(pdf_bytes: bytes, **options) -> dict:
+    """Upload PDF bytes, chunked for large files. Blocking - call via a thread."""
+    if len(pdf_bytes) > _LARGE_UPLOAD_THRESHOLD_BYTES:
+        return cloudinary.uploader.upload_large(
+            io.BytesIO(pdf_bytes), chunk_size=_LARGE_UPLOAD_CHUNK_BYTES, **options
+        )
+    return cloudinary.uploader.upload(pdf_bytes, **options)
+
 
 async def upload_pdf_to_cloudinary(
     file: UploadFile,
@@ -32,23 +49,29 @@ async def upload_pdf_to_cloudinary(
     try:
         logger.info(f"Starting Cloudinary upload for file: {file.filename}, folder: {folder}")
         
-        # Validate file type
-        if not file.filename or not file.filename.endswith('.pdf'):
-            logger.warning(f"Invalid file type: {file.filename}")
+        # Validate by magic bytes rather than filename suffix - accepts
+        # valid PDFs regardless of extension/case, rejects mislabeled files
+        # before any bandwidth is spent on the upload
+        head = await file.read(5)
+        if head != b"%PDF-":
+            logger.warning(f"File is not a PDF (magic bytes {head!r}): {file.filename}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Only PDF files are allowed"
             )
-        
-        # Read file content
+
+        # Read the rest of the content - the head was already consumed, so
+        # concatenate instead of seeking back and re-reading the stream
         logger.debug(f"Reading file content: {file.filename}")
-        file_content = await file.read()
+        file_content = head + await file.read()
         file_size = len(file_content)
         logger.debug(f"File size: {file_size} bytes")
         
-        # Upload to Cloudinary
+        # Upload to Cloudinary - threaded so concurrent uploads overlap
+        # instead of serializing on the blocking SDK call
         logger.info(f"Uploading to Cloudinary: {file.filename}")
-        upload_result = cloudinary.uploader.upload(
+        upload_result = await asyncio.to_thread(
+            upload_pdf_bytes_sync,
             file_content,
             folder=folder,
             resource_type=resource_type,
@@ -86,6 +109,50 @@ async def upload_pdf_to_cloudinary(
         )
 
 
+async def upload_image_bytes(
+    image_bytes: bytes,
+    folder: Optional[str] = "medicare/patients"
+) -> str:
+    """
+    Upload raw image bytes to Cloudinary and return the secure URL.
+
+    The blocking SDK call runs in a thread so parallel page uploads don't
+    stall the event loop.
+
+    Args:
+        image_bytes: Image content as bytes
+        folder: Cloudinary folder path for organization
+
+    Returns:
+        str: Secure URL of the uploaded image
+
+    Raises:
+        HTTPException: If upload fails
+    """
+    try:
+        upload_result = await asyncio.to_thread(
+            cloudinary.uploader.upload,
+            image_bytes,
+            folder=folder,
+            resource_type="image",
+            type="upload",
+            unique_filename=True,
+        )
+
+        secure_url = upload_result.get("secure_url") or upload_result.get("url")
+        if not secure_url:
+            raise ValueError("Cloudinary upload returned no URL")
+
+        return secure_url
+
+    except Exception as e:
+        logger.error(f"Error uploading image to Cloudinary: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload image to Cloudinary: {str(e)}"
+        )
+
+
 async def upload_multiple_pdfs_to_cloudinary(
     files: list[UploadFile],
     folder: Optional[str] = "medicare/patients",
@@ -106,11 +173,16 @@ async def upload_multiple_pdfs_to_cloudinary(
         HTTPException: If any upload fails
     """
     logger.info(f"Uploading {len(files)} files to Cloudinary")
-    urls = []
-    for idx, file in enumerate(files, 1):
-        logger.debug(f"Uploading file {idx}/{len(files)}: {file.filename if file.filename else 'unnamed'}")
-        url = await upload_pdf_to_cloudinary(file, folder, resource_type)
-        urls.append(url)
+
+    # Fan the independent uploads out concurrently; the semaphore keeps the
+    # number of in-flight requests within Cloudinary's per-account limits
+    semaphore = asyncio.Semaphore(8)
+
+    async def _upload_one(file: UploadFile) -> str:
+        async with semaphore:
+            return await upload_pdf_to_cloudinary(file, folder, resource_type)
+
+    urls = list(await asyncio.gather(*(_upload_one(file) for file in files)))
     logger.info(f"Successfully uploaded {len(urls)} files")
     return urls
 
@@ -1,55 +1,244 @@
 """PDF processing service for converting PDFs to images for AI processing."""
 
+import asyncio
 import io
 import logging
 import os
-from typing import List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, List, Tuple, Optional
 from fastapi import UploadFile, HTTPException, status
+import cloudinary.uploader
 import fitz
 import httpx
 from dotenv import load_dotenv
+import app.config.cloudinary  # Ensure Cloudinary is configured
+from app.utils.cloudinary_service import upload_pdf_bytes_sync
+
+# Imported once at module load (and once per render worker at startup)
+# instead of per call - the guarded form preserves the friendly missing-
+# dependency error from convert_markdown_to_pdf
+try:
+    import markdown
+except ImportError:
+    markdown = None
+try:
+    from xhtml2pdf import pisa
+except ImportError:
+    pisa = None
+
+# One converter per process - building a markdown.Markdown instance parses
+# the extension list, which is wasted work when repeated per document
+_MD = markdown.Markdown(extensions=['extra', 'nl2br', 'sane_lists']) if markdown is not None else None
+
+# Static CSS/HTML skeleton for generated PDFs, interned once at import.
+# Literal braces are doubled because the body is injected via str.format.
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        @page {{
+            size: A4;
+            margin: 2cm;
+        }}
+        body {{
+            font-family: Arial, Helvetica, sans-serif;
+            font-size: 11pt;
+            line-height: 1.6;
+            color: #000;
+            margin: 0;
+            padding: 0;
+        }}
+        h1 {{
+            font-size: 24pt;
+            font-weight: bold;
+            color: #2c3e50;
+            margin-top: 20pt;
+            margin-bottom: 15pt;
+            border-bottom: 2pt solid #3498db;
+            padding-bottom: 10pt;
+        }}
+        h2 {{
+            font-size: 18pt;
+            font-weight: bold;
+            color: #34495e;
+            margin-top: 18pt;
+            margin-bottom: 12pt;
+        }}
+        h3 {{
+            font-size: 14pt;
+            font-weight: bold;
+            color: #34495e;
+            margin-top: 15pt;
+            margin-bottom: 10pt;
+        }}
+        p {{
+            margin-bottom: 10pt;
+            text-align: justify;
+        }}
+        ul, ol {{
+            margin-bottom: 10pt;
+            padding-left: 20pt;
+        }}
+        li {{
+            margin-bottom: 5pt;
+        }}
+        strong {{
+            font-weight: bold;
+            color: #2c3e50;
+        }}
+        em {{
+            font-style: italic;
+        }}
+        hr {{
+            border: none;
+            border-top: 1pt solid #ddd;
+            margin: 15pt 0;
+        }}
+    </style>
+</head>
+<body>
+    {body}
+</body>
+</html>"""
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-async def convert_pdf_bytes_to_images(pdf_bytes: bytes) -> List[bytes]:
+# Worker pool for CPU-bound PDF work (page rasterization and HTML->PDF
+# rendering). Both are GIL-bound for most of their runtime, so a thread would
+# still stall the event loop's CPU; separate processes keep request handling
+# responsive and let pages render in parallel. Created lazily so importing
+# this module stays cheap.
+_PDF_RENDER_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pdf_render_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool used for CPU-bound PDF rendering work."""
+    global _PDF_RENDER_POOL
+    if _PDF_RENDER_POOL is None:
+        _PDF_RENDER_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _PDF_RENDER_POOL
+
+# Render resolution for PDF pages sent to the vision model, tunable per
+# deployment. 126 DPI (zoom 1.75) is plenty for text/table documents - the
+# model downscales larger images anyway.
+_PDF_RENDER_ZOOM = float(os.getenv("REPORT_IMAGE_DPI", "126")) / 72.0
+
+# A born-digital PDF averaging at least this many extractable characters
+# per page is parsed from its text layer directly - rasterization and
+# vision-model OCR are skipped entirely. Set to 0 to always rasterize.
+_MIN_TEXT_CHARS_PER_PAGE = int(os.getenv("PDF_TEXT_MIN_CHARS_PER_PAGE", "400"))
+
+
+@lru_cache(maxsize=1024)
+def _cloudinary_folder(patient_name: str, folder_suffix: str) -> str:
+    """Build the per-patient Cloudinary folder path (cached for repeat patients)."""
+    return f"medicare/patients/{patient_name.replace(' ', '_')}/{folder_suffix}"
+
+
+def _probe_pdf_text(pdf_bytes: bytes, min_chars_per_page: int) -> Optional[str]:
+    """Extract the text layer if the PDF is born-digital, else return None.
+
+    Runs inside a worker process. Scanned documents yield little or no
+    extractable text, so they fall through to rasterization.
+    """
+    # A non-positive threshold disables the text path entirely
+    if min_chars_per_page <= 0:
+        return None
+
+    pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        page_texts = [page.get_text("text") for page in pdf_document]
+        total_chars = sum(len(text) for text in page_texts)
+        if not page_texts or total_chars < min_chars_per_page * len(page_texts):
+            return None
+        return "\n\n".join(page_texts)
+    finally:
+        pdf_document.close()
+
+
+def _render_pdf_page(pdf_bytes: bytes, page_num: int, zoom: float, fmt: str) -> bytes:
+    """Render one PDF page to image bytes. Runs inside a worker process."""
+    pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        mat = fitz.Matrix(zoom, zoom)
+        pix = pdf_document[page_num].get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+        if fmt == "jpeg":
+            return pix.tobytes("jpeg", jpg_quality=85)
+        return pix.tobytes(fmt)
+    finally:
+        pdf_document.close()
+
+
+async def iter_pdf_pages_as_images(pdf_bytes: bytes, zoom: Optional[float] = None, fmt: str = "jpeg") -> AsyncIterator[bytes]:
+    """
+    Render PDF pages to images one at a time, in page order.
+
+    All pages are dispatched to the worker pool up front (so renders still
+    run in parallel), but results are yielded as each page becomes ready.
+    A consumer that processes pages incrementally holds one page in memory
+    at a time instead of the whole document.
+
+    Args:
+        pdf_bytes: PDF file content as bytes
+        zoom: Render scale (1.0 = 72 DPI); defaults to REPORT_IMAGE_DPI / 72
+        fmt: Output image format ("jpeg" or "png")
+
+    Yields:
+        bytes: Image bytes for each page, in order
+    """
+    # Open once on the main process only to count pages
+    logger.info("Opening PDF with PyMuPDF")
+    pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+    page_count = pdf_document.page_count
+    pdf_document.close()
+
+    if zoom is None:
+        zoom = _PDF_RENDER_ZOOM
+
+    # Dispatch all pages to the worker pool, then yield in page order
+    logger.info("Processing %d page(s)", page_count)
+    loop = asyncio.get_running_loop()
+    pool = _get_pdf_render_pool()
+    futures = [
+        loop.run_in_executor(pool, _render_pdf_page, pdf_bytes, page_num, zoom, fmt)
+        for page_num in range(page_count)
+    ]
+    for future in futures:
+        yield await future
+
+
+async def convert_pdf_bytes_to_images(pdf_bytes: bytes, zoom: Optional[float] = None, fmt: str = "jpeg") -> List[bytes]:
     """
     Convert PDF bytes to a list of images (one per page) using PyMuPDF.
-    
+
+    Pages are rendered grayscale (medical documents are text and tables) and
+    encoded as JPEG by default, which is 5-10x smaller than the old 180 DPI
+    RGB PNGs - smaller payloads, fewer vision tokens, faster uploads. Each
+    page renders in its own worker process (each worker opens its own handle
+    on the bytes), so multi-page documents scale with core count and the
+    event loop is never blocked by the render.
+
+    Callers that consume pages incrementally (and don't need every page in
+    memory at once) should prefer iter_pdf_pages_as_images.
+
     Args:
         pdf_bytes: PDF file content as bytes
-    
+        zoom: Render scale (1.0 = 72 DPI); defaults to REPORT_IMAGE_DPI / 72
+        fmt: Output image format ("jpeg" or "png")
+
     Returns:
-        List[bytes]: List of image bytes in PNG format (one per page)
+        List[bytes]: List of image bytes (one per page)
     """
     try:
-        # Open PDF document from bytes
-        logger.info("Opening PDF with PyMuPDF")
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        
-        image_bytes_list = []
-        
-        # Process each page
-        logger.info(f"Processing {len(pdf_document)} page(s)")
-        for page_num in range(len(pdf_document)):
-            logger.debug(f"Processing page {page_num + 1}/{len(pdf_document)}")
-            page = pdf_document[page_num]
-            
-            zoom = 2.5  # 2.0 = 144 DPI, 2.5 = 180 DPI, 3.0 = 216 DPI
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert pixmap to PNG bytes
-            img_bytes = pix.tobytes("png")
-            image_bytes_list.append(img_bytes)
-        
-        # Close the PDF document
-        pdf_document.close()
-        
-        logger.info(f"Successfully converted PDF to {len(image_bytes_list)} image(s)")
-        
+        image_bytes_list = [img async for img in iter_pdf_pages_as_images(pdf_bytes, zoom=zoom, fmt=fmt)]
+
+        logger.info("Successfully converted PDF to %d image(s)", len(image_bytes_list))
+
         return image_bytes_list
-        
+
     except Exception as e:
         logger.error(f"Error converting PDF bytes to images: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -60,19 +249,21 @@ async def convert_pdf_bytes_to_images(pdf_bytes: bytes) -> List[bytes]:
 
 async def convert_pdf_to_images(pdf_file: UploadFile) -> List[bytes]:
     """
-    Convert a PDF file to a list of images (one per page) using PyMuPDF.
-    
-    This function converts a PDF file to a list of images (one per page) using PyMuPDF.
-    The images are returned as bytes in PNG format.
+    Convert an uploaded PDF file to a list of images (one per page).
+
+    This is the only entry point that reads an UploadFile; it consumes the
+    stream exactly once and delegates to convert_pdf_bytes_to_images.
+    Callers that already hold the bytes should use the bytes variant
+    directly rather than re-reading the stream.
     """
     try:
         # Read PDF bytes
         logger.info(f"Reading PDF file: {pdf_file.filename}")
         pdf_bytes = await pdf_file.read()
-        
+
         # Reset file pointer for potential reuse
         await pdf_file.seek(0)
-        
+
         return await convert_pdf_bytes_to_images(pdf_bytes)
         
     except HTTPException:
@@ -85,201 +276,117 @@ async def convert_pdf_to_images(pdf_file: UploadFile) -> List[bytes]:
         )
 
 
-async def process_pdf_discharge_summary(pdf_file: UploadFile, patient_name: str) -> Tuple[str, List[bytes]]:
+async def _extract_text_or_rasterize(pdf_bytes: bytes, label: str) -> Tuple[List[bytes], Optional[str]]:
+    """Return (page images, None) for scanned PDFs or ([], text) for born-digital ones."""
+    loop = asyncio.get_running_loop()
+    pdf_text = await loop.run_in_executor(
+        _get_pdf_render_pool(), _probe_pdf_text, pdf_bytes, _MIN_TEXT_CHARS_PER_PAGE
+    )
+    if pdf_text is not None:
+        logger.info(f"{label.capitalize()} has an extractable text layer ({len(pdf_text)} chars) - skipping rasterization")
+        return [], pdf_text
+    return await convert_pdf_bytes_to_images(pdf_bytes), None
+
+
+async def _process_pdf(pdf_bytes: bytes, filename: str, patient_name: str, folder_suffix: str, label: str) -> Tuple[str, List[bytes], Optional[str]]:
     """
-    Complete workflow: Read PDF bytes, upload to Cloudinary, convert to images (for AI processing only).
+    Shared workflow: upload PDF bytes to Cloudinary and prepare the document
+    for AI parsing, returning (pdf_url, page images, extracted text).
+
+    Born-digital PDFs with a rich text layer skip rasterization entirely -
+    the extracted text is returned (with an empty image list) so the parser
+    can take a text-only path instead of vision OCR. Scanned documents
+    return rendered page images and None for the text.
+
+    The router reads the upload stream exactly once and hands the bytes
+    down, so large PDFs aren't copied out of the spooled temp file again
+    at the service layer.
+
+    Args:
+        pdf_bytes: PDF file content as bytes
+        filename: Original filename, for logging only
+        patient_name: Patient name for folder organization
+        folder_suffix: Cloudinary folder suffix (e.g. "reports", "bills")
+        label: Human-readable document kind for logs and error messages
     """
     try:
-        import cloudinary.uploader
-        
-        # Read PDF bytes first (before any operations consume the stream)
-        logger.info(f"Processing discharge summary PDF for patient: {patient_name}")
-        logger.info(f"Reading PDF file: {pdf_file.filename}")
-        pdf_bytes = await pdf_file.read()
-        logger.info(f"PDF file read: {len(pdf_bytes)} bytes")
-        
-        # Reset file pointer for potential reuse
-        await pdf_file.seek(0)
-        
-        # Upload PDF bytes to Cloudinary
-        folder_name = patient_name.replace(' ', '_')
-        folder = f"medicare/patients/{folder_name}/discharge_summaries"
-        
-        logger.info(f"Uploading PDF to Cloudinary folder: {folder}")
-        upload_result = cloudinary.uploader.upload(
-            pdf_bytes,
-            folder=folder,
-            resource_type="raw",
-            format="pdf",
-            type="upload",  # Explicitly set upload type
-            invalidate=True,  # Invalidate CDN cache
-            use_filename=True,  # Use original filename
-            unique_filename=True,  # Add unique suffix to avoid conflicts
+        logger.info("Processing %s PDF for patient: %s", label, patient_name)
+        logger.info("PDF file: %s (%d bytes)", filename, len(pdf_bytes))
+
+        # Upload PDF bytes to Cloudinary and prepare the parse input
+        # concurrently. The upload is network-bound (threaded off the loop,
+        # the SDK is sync) and the text probe / rasterization is CPU-bound,
+        # so the wall-clock cost is max of the two instead of their sum.
+        folder = _cloudinary_folder(patient_name, folder_suffix)
+
+        logger.info("Uploading PDF to Cloudinary folder: %s", folder)
+        upload_result, (image_bytes_list, pdf_text) = await asyncio.gather(
+            asyncio.to_thread(
+                upload_pdf_bytes_sync,
+                pdf_bytes,
+                folder=folder,
+                resource_type="raw",
+                format="pdf",
+                type="upload",  # Explicitly set upload type
+                invalidate=True,  # Invalidate CDN cache
+                use_filename=True,  # Use original filename
+                unique_filename=True,  # Add unique suffix to avoid conflicts
+            ),
+            _extract_text_or_rasterize(pdf_bytes, label),
         )
-        
+
         # Log full upload result for debugging
         logger.debug(f"Upload result: {upload_result}")
-        
+
         # Get secure URL - for raw files, use secure_url or url
         pdf_url = upload_result.get("secure_url") or upload_result.get("url")
         if not pdf_url:
             # Fallback: construct URL manually if not in response
-            import os
             public_id = upload_result.get("public_id", "")
             cloud_name = upload_result.get("cloud_name") or os.getenv("CLOUDINARY_CLOUD_NAME")
             pdf_url = f"https://res.cloudinary.com/{cloud_name}/raw/upload/{public_id}.pdf"
-        
+
         logger.info(f"PDF uploaded: {pdf_url}")
         logger.info(f"Public ID: {upload_result.get('public_id')}")
         logger.info(f"Resource type: {upload_result.get('resource_type')}")
-        
-        # Convert PDF bytes to images (using the bytes we already read)
-        logger.info("Converting PDF to images...")
-        image_bytes_list = await convert_pdf_bytes_to_images(pdf_bytes)
-        
-        logger.info(f"Discharge summary processing complete: PDF uploaded, {len(image_bytes_list)} image(s) ready for AI processing")
-        return pdf_url, image_bytes_list
-        
+
+        if pdf_text is not None:
+            logger.info(f"{label.capitalize()} processing complete: PDF uploaded, text layer ready for AI processing")
+        else:
+            logger.info(f"{label.capitalize()} processing complete: PDF uploaded, {len(image_bytes_list)} image(s) ready for AI processing")
+        return pdf_url, image_bytes_list, pdf_text
+
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing PDF discharge summary: {str(e)}", exc_info=True)
+        logger.error(f"Error processing PDF {label}: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process discharge summary: {str(e)}"
+            detail=f"Failed to process {label}: {str(e)}"
         )
 
 
-async def process_pdf_report(pdf_file: UploadFile, patient_name: str) -> Tuple[str, List[bytes]]:
+async def process_pdf_discharge_summary(pdf_bytes: bytes, filename: str, patient_name: str) -> Tuple[str, List[bytes], Optional[str]]:
+    """
+    Complete workflow: upload PDF bytes to Cloudinary, extract text or convert to images (for AI processing only).
+    """
+    return await _process_pdf(pdf_bytes, filename, patient_name, "discharge_summaries", "discharge summary")
+
+
+async def process_pdf_report(pdf_bytes: bytes, filename: str, patient_name: str) -> Tuple[str, List[bytes], Optional[str]]:
     """
-    Complete workflow: Read PDF bytes, upload to Cloudinary, convert to images (for AI processing only).
+    Complete workflow: upload PDF bytes to Cloudinary, extract text or convert to images (for AI processing only).
     Similar to process_pdf_discharge_summary but for medical reports.
     """
-    try:
-        import cloudinary.uploader
-        
-        # Read PDF bytes first (before any operations consume the stream)
-        logger.info(f"Processing report PDF for patient: {patient_name}")
-        logger.info(f"Reading PDF file: {pdf_file.filename}")
-        pdf_bytes = await pdf_file.read()
-        logger.info(f"PDF file read: {len(pdf_bytes)} bytes")
-        
-        # Reset file pointer for potential reuse
-        await pdf_file.seek(0)
-        
-        # Upload PDF bytes to Cloudinary
-        folder_name = patient_name.replace(' ', '_')
-        folder = f"medicare/patients/{folder_name}/reports"
-        
-        logger.info(f"Uploading PDF to Cloudinary folder: {folder}")
-        upload_result = cloudinary.uploader.upload(
-            pdf_bytes,
-            folder=folder,
-            resource_type="raw",
-            format="pdf",
-            type="upload",  # Explicitly set upload type
-            invalidate=True,  # Invalidate CDN cache
-            use_filename=True,  # Use original filename
-            unique_filename=True,  # Add unique suffix to avoid conflicts
-        )
-        
-        # Log full upload result for debugging
-        logger.debug(f"Upload result: {upload_result}")
-        
-        # Get secure URL - for raw files, use secure_url or url
-        pdf_url = upload_result.get("secure_url") or upload_result.get("url")
-        if not pdf_url:
-            # Fallback: construct URL manually if not in response
-            import os
-            public_id = upload_result.get("public_id", "")
-            cloud_name = upload_result.get("cloud_name") or os.getenv("CLOUDINARY_CLOUD_NAME")
-            pdf_url = f"https://res.cloudinary.com/{cloud_name}/raw/upload/{public_id}.pdf"
-        
-        logger.info(f"PDF uploaded: {pdf_url}")
-        logger.info(f"Public ID: {upload_result.get('public_id')}")
-        logger.info(f"Resource type: {upload_result.get('resource_type')}")
-        
-        # Convert PDF bytes to images (using the bytes we already read)
-        logger.info("Converting PDF to images...")
-        image_bytes_list = await convert_pdf_bytes_to_images(pdf_bytes)
-        
-        logger.info(f"Report processing complete: PDF uploaded, {len(image_bytes_list)} image(s) ready for AI processing")
-        return pdf_url, image_bytes_list
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error processing PDF report: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process report: {str(e)}"
-        )
+    return await _process_pdf(pdf_bytes, filename, patient_name, "reports", "report")
 
 
-async def process_pdf_bill(pdf_file: UploadFile, patient_name: str) -> Tuple[str, List[bytes]]:
+async def process_pdf_bill(pdf_bytes: bytes, filename: str, patient_name: str) -> Tuple[str, List[bytes], Optional[str]]:
     """
-    Complete workflow: Read PDF bytes, upload to Cloudinary, convert to images (for AI processing only).
+    Complete workflow: upload PDF bytes to Cloudinary, extract text or convert to images (for AI processing only).
     Similar to process_pdf_report but for medical bills.
     """
-    try:
-        import cloudinary.uploader
-        
-        # Read PDF bytes first (before any operations consume the stream)
-        logger.info(f"Processing bill PDF for patient: {patient_name}")
-        logger.info(f"Reading PDF file: {pdf_file.filename}")
-        pdf_bytes = await pdf_file.read()
-        logger.info(f"PDF file read: {len(pdf_bytes)} bytes")
-        
-        # Reset file pointer for potential reuse
-        await pdf_file.seek(0)
-        
-        # Upload PDF bytes to Cloudinary
-        folder_name = patient_name.replace(' ', '_')
-        folder = f"medicare/patients/{folder_name}/bills"
-        
-        logger.info(f"Uploading PDF to Cloudinary folder: {folder}")
-        upload_result = cloudinary.uploader.upload(
-            pdf_bytes,
-            folder=folder,
-            resource_type="raw",
-            format="pdf",
-            type="upload",  # Explicitly set upload type
-            invalidate=True,  # Invalidate CDN cache
-            use_filename=True,  # Use original filename
-            unique_filename=True,  # Add unique suffix to avoid conflicts
-        )
-        
-        # Log full upload result for debugging
-        logger.debug(f"Upload result: {upload_result}")
-        
-        # Get secure URL - for raw files, use secure_url or url
-        pdf_url = upload_result.get("secure_url") or upload_result.get("url")
-        if not pdf_url:
-            # Fallback: construct URL manually if not in response
-            import os
-            public_id = upload_result.get("public_id", "")
-            cloud_name = upload_result.get("cloud_name") or os.getenv("CLOUDINARY_CLOUD_NAME")
-            pdf_url = f"https://res.cloudinary.com/{cloud_name}/raw/upload/{public_id}.pdf"
-        
-        logger.info(f"PDF uploaded: {pdf_url}")
-        logger.info(f"Public ID: {upload_result.get('public_id')}")
-        logger.info(f"Resource type: {upload_result.get('resource_type')}")
-        
-        # Convert PDF bytes to images (using the bytes we already read)
-        logger.info("Converting PDF to images...")
-        image_bytes_list = await convert_pdf_bytes_to_images(pdf_bytes)
-        
-        logger.info(f"Bill processing complete: PDF uploaded, {len(image_bytes_list)} image(s) ready for AI processing")
-        return pdf_url, image_bytes_list
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error processing PDF bill: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process bill: {str(e)}"
-        )
+    return await _process_pdf(pdf_bytes, filename, patient_name, "bills", "bill")
 
 async def convert_markdown_to_pdf(markdown_content: str, patient_name: str, folder_suffix: str = "action_plans") -> Optional[str]:
     """
@@ -302,112 +409,17 @@ async def convert_markdown_to_pdf(markdown_content: str, patient_name: str, fold
         return None
     
     try:
-        import cloudinary.uploader
-        import markdown
-        from xhtml2pdf import pisa
-        
-        # Step 1: Convert markdown to HTML
-        logger.info(f"Step 1: Converting markdown to HTML for {folder_suffix}...")
-        html_content = markdown.markdown(
-            markdown_content,
-            extensions=['extra', 'nl2br', 'sane_lists']
-        )
-        
-        # Wrap HTML content with proper structure and styling for PDF
-        html_document = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <style>
-        @page {{
-            size: A4;
-            margin: 2cm;
-        }}
-        body {{
-            font-family: Arial, Helvetica, sans-serif;
-            font-size: 11pt;
-            line-height: 1.6;
-            color: #000;
-            margin: 0;
-            padding: 0;
-        }}
-        h1 {{
-            font-size: 24pt;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-top: 20pt;
-            margin-bottom: 15pt;
-            border-bottom: 2pt solid #3498db;
-            padding-bottom: 10pt;
-        }}
-        h2 {{
-            font-size: 18pt;
-            font-weight: bold;
-            color: #34495e;
-            margin-top: 18pt;
-            margin-bottom: 12pt;
-        }}
-        h3 {{
-            font-size: 14pt;
-            font-weight: bold;
-            color: #34495e;
-            margin-top: 15pt;
-            margin-bottom: 10pt;
-        }}
-        p {{
-            margin-bottom: 10pt;
-            text-align: justify;
-        }}
-        ul, ol {{
-            margin-bottom: 10pt;
-            padding-left: 20pt;
-        }}
-        li {{
-            margin-bottom: 5pt;
-        }}
-        strong {{
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        em {{
-            font-style: italic;
-        }}
-        hr {{
-            border: none;
-            border-top: 1pt solid #ddd;
-            margin: 15pt 0;
-        }}
-    </style>
-</head>
-<body>
-    {html_content}
-</body>
-</html>"""
-        
-        # Step 2: Convert HTML to PDF bytes using xhtml2pdf
-        logger.info(f"Step 2: Converting HTML to PDF for {folder_suffix}...")
-        pdf_buffer = io.BytesIO()
-        pisa_status = pisa.CreatePDF(
-            src=html_document,
-            dest=pdf_buffer,
-            encoding='utf-8'
-        )
-        
-        if pisa_status.err:
-            logger.error(f"Error creating PDF: {pisa_status.err}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create PDF from HTML: {pisa_status.err}"
-            )
-        
-        pdf_bytes = pdf_buffer.getvalue()
-        pdf_buffer.close()
+        # Steps 1+2: Render markdown to PDF bytes in a worker process - the
+        # render is GIL-bound CPU work that would otherwise freeze the event
+        # loop for its whole duration
+        logger.info(f"Rendering markdown to PDF for {folder_suffix}...")
+        loop = asyncio.get_running_loop()
+        pdf_bytes = await loop.run_in_executor(_get_pdf_render_pool(), _render_markdown_pdf, markdown_content)
         logger.info(f"PDF generated: {len(pdf_bytes)} bytes")
-        
+
         # Step 3: Upload PDF to Cloudinary
-        folder_name = patient_name.replace(' ', '_')
-        folder = f"medicare/patients/{folder_name}/{folder_suffix}"
-        
+        folder = _cloudinary_folder(patient_name, folder_suffix)
+
         logger.info(f"Step 3: Uploading PDF to Cloudinary folder: {folder}")
         upload_result = cloudinary.uploader.upload(
             pdf_bytes,
@@ -419,17 +431,17 @@ async def convert_markdown_to_pdf(markdown_content: str, patient_name: str, fold
             use_filename=True,
             unique_filename=True,
         )
-        
+
         # Get secure URL
         pdf_url = upload_result.get("secure_url") or upload_result.get("url")
         if not pdf_url:
             public_id = upload_result.get("public_id", "")
             cloud_name = upload_result.get("cloud_name") or os.getenv("CLOUDINARY_CLOUD_NAME")
             pdf_url = f"https://res.cloudinary.com/{cloud_name}/raw/upload/{public_id}.pdf"
-        
+
         logger.info(f"PDF uploaded: {pdf_url}")
         return pdf_url
-        
+
     except ImportError as e:
         missing_lib = "markdown" if "markdown" in str(e) else "xhtml2pdf"
         logger.error(f"{missing_lib} is not installed. Please install it: pip install {missing_lib}")
@@ -447,6 +459,36 @@ async def convert_markdown_to_pdf(markdown_content: str, patient_name: str, fold
         )
 
 
+def _render_markdown_pdf(markdown_content: str) -> bytes:
+    """Render markdown content to PDF bytes. Runs inside a worker process."""
+    if markdown is None:
+        raise ImportError("markdown is not installed")
+    if pisa is None:
+        raise ImportError("xhtml2pdf is not installed")
+
+    # Reuse the per-process converter; reset() clears its internal state
+    # between documents (the pattern the markdown library recommends for
+    # repeated conversions)
+    html_content = _MD.reset().convert(markdown_content)
+
+    # Wrap HTML content with proper structure and styling for PDF
+    html_document = _HTML_TEMPLATE.format(body=html_content)
+
+    pdf_buffer = io.BytesIO()
+    pisa_status = pisa.CreatePDF(
+        src=html_document,
+        dest=pdf_buffer,
+        encoding='utf-8'
+    )
+
+    if pisa_status.err:
+        raise RuntimeError(f"Failed to create PDF from HTML: {pisa_status.err}")
+
+    pdf_bytes = pdf_buffer.getvalue()
+    pdf_buffer.close()
+    return pdf_bytes
+
+
 async def generate_action_plan_pdf(action_plan: str, patient_name: str) -> Optional[str]:
     """
     Generate a PDF from markdown action_plan by converting markdown to HTML, then to PDF and upload to Cloudinary.